@@ -0,0 +1,88 @@
+"""Fixtures for the Cuby benchmarks.
+
+Run with ``pytest benchmarks``. The fleet sizes and the simulated cloud
+behaviour are read from ``CUBY_BENCH_FLEET_SIZES``, ``CUBY_BENCH_LATENCY``,
+``CUBY_BENCH_JITTER`` and ``CUBY_BENCH_ERROR_RATE``. Results are written to
+``CUBY_BENCH_OUTPUT`` (``benchmarks/results/<version>.json`` by default).
+"""
+import json
+import os
+import platform
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from .fake_cloud import FakeCubyCloud
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+FLEET_SIZES = [
+    int(size) for size in os.environ.get("CUBY_BENCH_FLEET_SIZES", "1,10,100,500").split(",")
+]
+LATENCY = float(os.environ.get("CUBY_BENCH_LATENCY", "0.01"))
+JITTER = float(os.environ.get("CUBY_BENCH_JITTER", "0.005"))
+ERROR_RATE = float(os.environ.get("CUBY_BENCH_ERROR_RATE", "0"))
+
+MANIFEST = Path(__file__).parent.parent / "custom_components" / "cuby" / "manifest.json"
+
+_RESULTS = []
+
+
+def pytest_generate_tests(metafunc):
+    """Run every benchmark for each configured fleet size."""
+    if "fleet_size" in metafunc.fixturenames:
+        metafunc.parametrize("fleet_size", FLEET_SIZES)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable custom integrations in Home Assistant."""
+    yield
+
+
+@pytest.fixture
+async def fake_cloud(fleet_size, socket_enabled):
+    """Serve a fake Cuby cloud and point the integration at it."""
+    cloud = FakeCubyCloud(fleet_size, LATENCY, JITTER, ERROR_RATE)
+    url = await cloud.start()
+    with patch("custom_components.cuby.API_BASE_URL", url):
+        yield cloud
+    await cloud.stop()
+
+
+@pytest.fixture
+def record():
+    """Return a callable that stores a benchmark result."""
+
+    def _record(name: str, fleet_size: int, **values) -> None:
+        _RESULTS.append({"benchmark": name, "fleet_size": fleet_size, **values})
+
+    return _record
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write the collected results so they can be compared between releases."""
+    if not _RESULTS:
+        return
+    version = json.loads(MANIFEST.read_text())["version"]
+    output = Path(
+        os.environ.get(
+            "CUBY_BENCH_OUTPUT",
+            Path(__file__).parent / "results" / f"{version}.json",
+        )
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "version": version,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "cloud": {"latency": LATENCY, "jitter": JITTER, "error_rate": ERROR_RATE},
+                "results": _RESULTS,
+            },
+            indent=2,
+        )
+    )
@@ -0,0 +1,129 @@
+"""In-process stand-in for the Cuby cloud API used by the benchmarks."""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import Counter
+
+from aiohttp import web
+
+
+class FakeCubyCloud:
+    """Serve the Cuby v2 endpoints for a synthetic fleet of devices.
+
+    Every request waits ``latency`` seconds plus up to ``jitter`` seconds and
+    fails with a 503 with probability ``error_rate``. Requests are counted per
+    endpoint, and the arrival time of every state change is recorded.
+    """
+
+    def __init__(
+        self,
+        fleet_size: int,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the fake cloud."""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = Counter()
+        self.commands = []
+        self._random = random.Random(seed)
+        self._runner = None
+        self.url = None
+        self.devices = {
+            f"device_{index}": {
+                "id": f"device_{index}",
+                "name": f"Bench AC {index}",
+                "model": "Bench Model",
+                "firmware_version": "1.0.0",
+                "online": True,
+                "wifi_signal": -60,
+            }
+            for index in range(fleet_size)
+        }
+        self.states = {
+            device_id: {
+                "power": True,
+                "mode": "cool",
+                "target_temperature": 24,
+                "current_temperature": 26,
+                "fan_mode": "auto",
+                "swing": "off",
+            }
+            for device_id in self.devices
+        }
+
+    async def start(self) -> str:
+        """Start serving on a free local port and return the API base URL."""
+        app = web.Application(middlewares=[self._simulate])
+        app.router.add_post("/api/v2/token/{username}", self._token)
+        app.router.add_get("/api/v2/devices", self._devices)
+        app.router.add_get("/api/v2/devices/{device_id}", self._device)
+        app.router.add_get("/api/v2/devices/{device_id}/state", self._get_state)
+        app.router.add_post("/api/v2/devices/{device_id}/state", self._set_state)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/api/v2"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset(self) -> None:
+        """Forget the requests counted so far."""
+        self.requests.clear()
+        self.commands.clear()
+
+    @web.middleware
+    async def _simulate(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count the request and apply the simulated latency and errors."""
+        route = request.match_info.route.resource.canonical
+        self.requests[f"{request.method} {route}"] += 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self._random.random() < self.error_rate:
+            return web.json_response({"status": "error"}, status=503)
+        return await handler(request)
+
+    async def _token(self, request: web.Request) -> web.Response:
+        """Issue a token."""
+        return web.json_response({"status": "ok", "token": "bench-token"})
+
+    async def _devices(self, request: web.Request) -> web.Response:
+        """Return the device list."""
+        return web.json_response(list(self.devices.values()))
+
+    async def _device(self, request: web.Request) -> web.Response:
+        """Return the info of a device."""
+        if (device := self.devices.get(request.match_info["device_id"])) is None:
+            return web.json_response({}, status=404)
+        return web.json_response(device)
+
+    async def _get_state(self, request: web.Request) -> web.Response:
+        """Return the state of a device."""
+        if (state := self.states.get(request.match_info["device_id"])) is None:
+            return web.json_response({}, status=404)
+        return web.json_response(state)
+
+    async def _set_state(self, request: web.Request) -> web.Response:
+        """Apply a state change to a device."""
+        device_id = request.match_info["device_id"]
+        if device_id not in self.states:
+            return web.json_response({}, status=404)
+        changes = await request.json()
+        self.commands.append((time.perf_counter(), device_id, changes))
+        if "temperature" in changes:
+            changes["target_temperature"] = changes.pop("temperature")
+        self.states[device_id].update(changes)
+        return web.json_response({"status": "ok"})
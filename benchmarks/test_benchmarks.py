@@ -0,0 +1,104 @@
+"""Benchmarks of the Cuby integration against a fake Cuby cloud."""
+import gc
+import time
+import tracemalloc
+
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN, SERVICE_SET_TEMPERATURE
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.cuby import DOMAIN
+from custom_components.cuby.coordinator import CubyPollScheduler
+
+
+async def _setup_entry(hass):
+    """Set up a config entry for the fake cloud account."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="bench@example.com",
+        data={"username": "bench@example.com", "password": "bench", "expiration": 0},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_setup_time(hass, fake_cloud, fleet_size, record):
+    """Measure how long async_setup_entry takes and how many requests it makes."""
+    start = time.perf_counter()
+    await _setup_entry(hass)
+    elapsed = time.perf_counter() - start
+
+    record(
+        "setup",
+        fleet_size,
+        seconds=elapsed,
+        requests=sum(fake_cloud.requests.values()),
+        requests_by_endpoint=dict(fake_cloud.requests),
+    )
+
+
+async def test_requests_per_poll_cycle(hass, fake_cloud, fleet_size, record):
+    """Measure the requests needed to refresh the whole fleet once."""
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    fake_cloud.reset()
+
+    # A fresh scheduler makes every device due, i.e. a full poll cycle.
+    coordinator.scheduler = CubyPollScheduler()
+    start = time.perf_counter()
+    await coordinator.async_refresh()
+    elapsed = time.perf_counter() - start
+
+    record(
+        "poll_cycle",
+        fleet_size,
+        seconds=elapsed,
+        requests=sum(fake_cloud.requests.values()),
+        requests_per_device=sum(fake_cloud.requests.values()) / fleet_size,
+    )
+
+
+async def test_command_latency(hass, fake_cloud, fleet_size, record):
+    """Measure the time from a service call to the state change reaching the cloud."""
+    await _setup_entry(hass)
+    entity_id = hass.states.async_entity_ids(CLIMATE_DOMAIN)[0]
+    fake_cloud.reset()
+
+    start = time.perf_counter()
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_TEMPERATURE,
+        {ATTR_ENTITY_ID: entity_id, ATTR_TEMPERATURE: 21},
+        blocking=True,
+    )
+    arrived = fake_cloud.commands[0][0]
+
+    record(
+        "command_latency",
+        fleet_size,
+        seconds=arrived - start,
+        service_call_seconds=time.perf_counter() - start,
+    )
+
+
+async def test_memory_per_entity(hass, fake_cloud, fleet_size, record):
+    """Measure the memory allocated per entity while setting up."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    await _setup_entry(hass)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    entities = len(hass.states.async_all())
+    record(
+        "memory",
+        fleet_size,
+        bytes_total=allocated,
+        entities=entities,
+        bytes_per_entity=allocated / entities,
+    )
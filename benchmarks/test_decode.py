@@ -0,0 +1,57 @@
+"""Micro-benchmark of the JSON decoding done in a poll cycle."""
+import json
+import time
+
+import pytest
+
+from custom_components.cuby.models import CubyDevice, CubyDeviceState, pick_fields
+
+from .fake_cloud import FakeCubyCloud
+
+DECODERS = {"json": json.loads}
+try:
+    import orjson
+except ImportError:
+    pass
+else:
+    DECODERS["orjson"] = orjson.loads
+
+ROUNDS = 20
+
+
+def _poll_cycle(decoder, state_bodies, info_bodies) -> None:
+    """Decode and parse one state and one info response per device."""
+    for state_body, info_body in zip(state_bodies, info_bodies):
+        state = CubyDeviceState.from_dict(
+            pick_fields(decoder(state_body), CubyDeviceState.FIELDS)
+        )
+        info = pick_fields(decoder(info_body), CubyDevice.PAYLOAD_FIELDS)
+        CubyDevice(info["id"], info, state)
+
+
+@pytest.mark.parametrize("decoder", list(DECODERS))
+def test_decode_cpu_per_poll_cycle(fleet_size, decoder, record):
+    """Measure the CPU time spent decoding a full poll cycle."""
+    cloud = FakeCubyCloud(fleet_size)
+    state_bodies = [json.dumps(state).encode() for state in cloud.states.values()]
+    info_bodies = [json.dumps(info).encode() for info in cloud.devices.values()]
+    device_list = json.dumps(list(cloud.devices.values())).encode()
+    loads = DECODERS[decoder]
+
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        _poll_cycle(loads, state_bodies, info_bodies)
+    poll_cpu = (time.process_time() - start) / ROUNDS
+
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        [pick_fields(device, CubyDevice.PAYLOAD_FIELDS) for device in loads(device_list)]
+    list_cpu = (time.process_time() - start) / ROUNDS
+
+    record(
+        "decode",
+        fleet_size,
+        decoder=decoder,
+        cpu_seconds_per_poll_cycle=poll_cpu,
+        cpu_seconds_per_device_list=list_cpu,
+    )
@@ -1,10 +1,22 @@
 """The Cuby A/C Control integration."""
+from __future__ import annotations
+
+import json
 import logging
 import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+
 import aiohttp
 import voluptuous as vol
 
-from homeassistant.core import HomeAssistant
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson ships with Home Assistant, but is not required
+    from json import loads as json_loads
+
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONF_USERNAME,
@@ -12,15 +24,53 @@ from homeassistant.const import (
     Platform,
 )
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    DOMAIN,
+    CONF_EXPIRATION,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_REQUEST_TIMEOUT,
+    DATA_DEVICE_CACHE,
+    DATA_ACCOUNTS,
+    DEVICE_CACHE_TTL,
+    API_BASE_URL,
+    TOKEN_REFRESH_MARGIN,
+    DEFAULT_COMMAND_DEBOUNCE,
+    DEFAULT_CACHE_TTLS,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_BURST,
+    DEFAULT_MAX_RETRIES,
+    GROUP_COMMAND_ATTEMPTS,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_STATUSES,
+    BREAKER_FAILURE_THRESHOLD,
+    DEVICE_BREAKER_FAILURE_THRESHOLD,
+    BREAKER_COOLDOWN,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_RATE_LIMIT,
+    CONF_RATE_BURST,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    MIN_TEMPERATURE,
+    MAX_TEMPERATURE,
+)
+from .breaker import CubyCircuitBreaker
+from .cache import CubyResponseCache
+from .metrics import CubyMetrics
+from .models import CubyCapabilities, CubyDevice, CubyDeviceState, pick_fields
+from .modes import HVAC_MODES, FAN_MODES, SWING_MODES, COMMAND_MODES
+from .coordinator import CubyDataUpdateCoordinator
+from .ratelimit import CubyRateLimiter
+from .services import async_setup_services
+from .store import CubyStore
 
 _LOGGER = logging.getLogger(__name__)
 
 # Add debug logging at module level
 _LOGGER.debug("Loading Cuby integration")
 
-DOMAIN = "cuby"
-CONF_EXPIRATION = "expiration"
-
 PLATFORMS = [Platform.CLIMATE, Platform.SENSOR]
 
 CONFIG_SCHEMA = vol.Schema(
@@ -42,16 +92,86 @@ class CubyConnectionError(Exception):
 class CubyAuthError(Exception):
     """Error to indicate an authentication error occurred."""
 
+def _payload_size(kwargs: dict) -> int:
+    """Return the size, in bytes, of the body a request will send."""
+    if kwargs.get("json") is not None:
+        # aiohttp serializes ``json`` payloads with the standard json module.
+        return len(json.dumps(kwargs["json"]).encode())
+    data = kwargs.get("data")
+    if isinstance(data, str):
+        return len(data.encode())
+    return len(data) if isinstance(data, (bytes, bytearray)) else 0
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Return an exponential backoff delay with full jitter."""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2**attempt))
+
+class _CubyWrite:
+    """Merged state changes sent to a device in one request."""
+
+    __slots__ = ("seq", "state", "future", "task", "superseded_by")
+
+    def __init__(self, seq: int, future: asyncio.Future) -> None:
+        """Initialize the write."""
+        self.seq = seq
+        self.state: dict = {}
+        self.future = future
+        self.task: asyncio.Task | None = None
+        self.superseded_by: _CubyWrite | None = None
+
 class CubyAPI:
     """Cuby API client."""
 
-    def __init__(self, username: str, password: str, expiration: int = 0):
-        """Initialize the API client."""
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        expiration: int = 0,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        session: aiohttp.ClientSession | None = None,
+        command_debounce: float = DEFAULT_COMMAND_DEBOUNCE,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        rate_burst: int = DEFAULT_RATE_BURST,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        cache_ttls: dict[str, float] | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        """Initialize the API client.
+
+        When ``session`` is given it is shared and left open by ``async_close``;
+        otherwise the client creates and owns its own session. ``cache_ttls``
+        sets how long GET responses of each endpoint are cached.
+        """
         self.username = username
         self.password = password
         self.expiration = expiration
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        self.command_debounce = command_debounce
+        self.max_retries = max_retries
+        self.rate_limiter = CubyRateLimiter(rate_limit, rate_burst)
+        self.breaker = CubyCircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN)
+        self.device_breakers = {}
+        # Devices whose latest request was rejected by an open breaker.
+        self.short_circuited: set[str] = set()
+        self.metrics = CubyMetrics()
+        self.cache = CubyResponseCache(
+            DEFAULT_CACHE_TTLS if cache_ttls is None else cache_ttls, cache_size
+        )
+        self._inflight_gets: dict[str, asyncio.Task] = {}
         self.token = None
-        self._session = None
+        self._token_issued = None
+        self._auth_lock = asyncio.Lock()
+        self._refresh_task = None
+        self._session = session
+        self._owns_session = session is None
+        self._pending_commands: dict[str, _CubyWrite] = {}
+        self._inflight_writes: dict[str, _CubyWrite] = {}
+        self._flush_tasks = {}
+        self._write_locks: dict[str, asyncio.Lock] = {}
+        self._write_seqs: dict[str, int] = {}
 
     async def authenticate(self) -> bool:
         """Authenticate with the Cuby API."""
@@ -59,19 +179,22 @@ class CubyAPI:
             self._session = aiohttp.ClientSession()
 
         try:
-            url = f"https://cuby.cloud/api/v2/token/{self.username}"
             payload = {
                 "password": self.password,
                 "expiration": self.expiration
             }
 
-            async with self._session.post(url, json=payload) as response:
+            await self.rate_limiter.acquire(write=True)
+            async with self._timed_request(
+                "POST", f"token/{self.username}", json=payload
+            ) as response:
                 if response.status == 401:
                     raise CubyAuthError("Invalid credentials")
                 response.raise_for_status()
-                data = await response.json()
+                data = json_loads(await response.read())
                 if data.get("status") == "ok":
                     self.token = data.get("token")
+                    self._token_issued = time.monotonic()
                     return True
                 return False
         except aiohttp.ClientError as err:
@@ -80,140 +203,740 @@ class CubyAPI:
             _LOGGER.error("Error authenticating with Cuby API: %s", err)
             return False
 
+    async def async_close(self) -> None:
+        """Cancel background work and close the session if this client owns it."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+        for write in self._inflight_writes.values():
+            write.task.cancel()
+        for write in (*self._pending_commands.values(), *self._inflight_writes.values()):
+            if not write.future.done():
+                write.future.set_result(False)
+        self._pending_commands.clear()
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def export_token(self) -> dict | None:
+        """Return the token and its wall-clock issue time, for persisting."""
+        if self.token is None or self._token_issued is None:
+            return None
+        age = time.monotonic() - self._token_issued
+        return {"token": self.token, "issued_at": time.time() - age}
+
+    def restore_token(self, data: dict | None) -> bool:
+        """Reuse a persisted token if it has not expired yet."""
+        if not data:
+            return False
+        age = time.time() - data["issued_at"]
+        if age < 0 or (self.expiration and age >= self.expiration):
+            return False
+        self.token = data["token"]
+        self._token_issued = time.monotonic() - age
+        return True
+
+    def _token_age_exceeds(self, margin: float) -> bool:
+        """Return True if the token is within ``margin`` seconds of expiring."""
+        if not self.expiration or self._token_issued is None:
+            return False
+        return time.monotonic() - self._token_issued >= self.expiration - margin
+
+    async def _async_ensure_token(self) -> bool:
+        """Make sure a usable token is available before a request.
+
+        An expired token is replaced before the request is sent. A token that
+        is about to expire is still used, while a replacement is fetched in the
+        background so callers do not wait on it.
+        """
+        if self.token is None or self._token_age_exceeds(0):
+            return await self._async_refresh_token(self.token)
+
+        margin = min(TOKEN_REFRESH_MARGIN, self.expiration / 10)
+        if self._token_age_exceeds(margin) and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.create_task(
+                self._async_background_refresh(self.token)
+            )
+        return True
+
+    async def _async_refresh_token(self, stale_token) -> bool:
+        """Replace ``stale_token``, sharing one authentication between callers."""
+        async with self._auth_lock:
+            if self.token is not None and self.token != stale_token:
+                return True
+            return await self.authenticate()
+
+    async def _async_background_refresh(self, stale_token) -> None:
+        """Refresh the token ahead of its expiry."""
+        try:
+            await self._async_refresh_token(stale_token)
+        except Exception as err:
+            _LOGGER.warning("Error refreshing Cuby token: %s", err)
+
+    def _retry_delay(self, response: aiohttp.ClientResponse, attempt: int) -> float:
+        """Return how long to wait before retrying a throttled or failed request.
+
+        A ``Retry-After`` header is honoured, up to ``RETRY_BACKOFF_MAX``, and
+        pauses every request of this client; otherwise the delay is
+        exponential backoff with full jitter.
+        """
+        try:
+            delay = float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return _backoff_delay(attempt)
+        delay = min(max(delay, 0), RETRY_BACKOFF_MAX)
+        self.rate_limiter.pause(delay)
+        return delay
+
+    def device_breaker(self, device_id: str) -> CubyCircuitBreaker:
+        """Return the circuit breaker of a device."""
+        if device_id not in self.device_breakers:
+            self.device_breakers[device_id] = CubyCircuitBreaker(
+                DEVICE_BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN
+            )
+        return self.device_breakers[device_id]
+
+    def diagnostics(self) -> dict:
+        """Return the client's metrics and health for diagnostics."""
+        return {
+            "metrics": self.metrics.as_dict(),
+            "cache": self.cache.as_dict(),
+            "breaker": self.breaker.as_dict(),
+            "device_breakers": {
+                device_id: breaker.as_dict()
+                for device_id, breaker in self.device_breakers.items()
+            },
+        }
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        decode: bool = True,
+        device_id: str | None = None,
+        **kwargs,
+    ) -> tuple:
+        """Send an authenticated request and return its status and JSON body.
+
+        Requests are paced by the rate limiter, with writes served before
+        reads. A 401 response re-authenticates once and replays the request,
+        and 429/5xx responses are retried up to ``max_retries`` times. The
+        body is only decoded for successful responses when ``decode`` is set.
+
+        While the client's or the device's circuit breaker is open the request
+        is not sent and ``(None, None)`` is returned straight away.
+
+        GETs of endpoints with a cache TTL are served from the response cache.
+        """
+        if method == "GET" and self.cache.ttl(path):
+            return await self._cached_get(path, device_id, **kwargs)
+        status, data, _ = await self._guarded_request(
+            method, path, decode, device_id, **kwargs
+        )
+        return status, data
+
+    async def _cached_get(
+        self, path: str, device_id: str | None = None, **kwargs
+    ) -> tuple:
+        """Serve a GET from the cache, revalidating it when it has expired.
+
+        Concurrent identical GETs share one request to the server.
+        """
+        entry = self.cache.get(path)
+        if entry is not None and entry.fresh:
+            self.cache.hits += 1
+            return 200, entry.data
+
+        if (task := self._inflight_gets.get(path)) is not None:
+            self.cache.hits += 1
+        else:
+            self.cache.misses += 1
+            task = asyncio.create_task(self._async_revalidate(path, device_id, **kwargs))
+            self._inflight_gets[path] = task
+            task.add_done_callback(lambda _: self._inflight_gets.pop(path, None))
+        return await asyncio.shield(task)
+
+    async def _async_revalidate(
+        self, path: str, device_id: str | None = None, **kwargs
+    ) -> tuple:
+        """Fetch a cacheable GET, sending the validators of a stale entry.
+
+        A failed fetch drops the entry, so it is not revalidated later.
+        """
+        entry = self.cache.get(path)
+        headers = entry.validators() if entry is not None else {}
+        try:
+            status, data, response_headers = await self._guarded_request(
+                "GET", path, True, device_id, headers=headers, **kwargs
+            )
+        except Exception:
+            self.cache.invalidate(path)
+            raise
+        if status == 304 and entry is not None:
+            self.cache.renew(path)
+            return 200, entry.data
+        if status == 200:
+            self.cache.store(
+                path,
+                data,
+                response_headers.get("ETag"),
+                response_headers.get("Last-Modified"),
+            )
+        elif status is not None:
+            self.cache.invalidate(path)
+        return status, data
+
+    async def _guarded_request(
+        self,
+        method: str,
+        path: str,
+        decode: bool = True,
+        device_id: str | None = None,
+        **kwargs,
+    ) -> tuple:
+        """Send a request unless a circuit breaker is open.
+
+        Returns the status, the decoded body and the response headers.
+        Requests rejected by a breaker add their device to
+        ``short_circuited``; requests that are sent remove it.
+        """
+        breaker = self.device_breaker(device_id) if device_id else None
+        if not self.breaker.allow() or (breaker and not breaker.allow()):
+            _LOGGER.debug("Circuit open, skipping request to %s", path)
+            if device_id:
+                self.short_circuited.add(device_id)
+            return None, None, {}
+        self.short_circuited.discard(device_id)
+
+        try:
+            status, data, headers = await self._send_request(
+                method, path, decode, **kwargs
+            )
+        except aiohttp.ClientConnectionError:
+            self.breaker.record_failure()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            (breaker or self.breaker).record_failure()
+            raise
+
+        if status is None:
+            self.breaker.record_failure()
+            return status, data, headers
+        # Throttling and server errors count against the cloud as a whole,
+        # as well as against the device they were for.
+        if status in RETRY_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        if breaker:
+            if status in RETRY_STATUSES or status == 404:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        return status, data, headers
+
+    @asynccontextmanager
+    async def _timed_request(self, method: str, path: str, **kwargs):
+        """Send a request, recording its latency, sizes and outcome.
+
+        Only the HTTP exchange is bounded by ``request_timeout``; time spent
+        waiting for the rate limiter or a retry backoff is not.
+        """
+        metrics = self.metrics.endpoint(path)
+        sent = _payload_size(kwargs)
+        start = time.monotonic()
+        recorded = False
+        try:
+            async with self._session.request(
+                method,
+                f"{API_BASE_URL}/{path}",
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                **kwargs,
+            ) as response:
+                body = await response.read()
+                metrics.record(
+                    time.monotonic() - start, len(body), response.status >= 400, sent
+                )
+                recorded = True
+                yield response
+        except (aiohttp.ClientError, asyncio.TimeoutError, asyncio.CancelledError):
+            if not recorded:
+                metrics.record(time.monotonic() - start, 0, True, sent)
+            raise
+
+    async def _send_request(
+        self,
+        method: str,
+        path: str,
+        decode: bool,
+        headers: dict | None = None,
+        **kwargs,
+    ) -> tuple:
+        """Send a request, handling re-authentication and retries."""
+        if not await self._async_ensure_token():
+            return None, None, {}
+
+        reauthenticated = False
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(write=method != "GET")
+            token = self.token
+            async with self._timed_request(
+                method,
+                path,
+                headers={**(headers or {}), "Authorization": f"Bearer {token}"},
+                **kwargs,
+            ) as response:
+                status = response.status
+                if status == 401 and not reauthenticated:
+                    delay = None
+                elif status in RETRY_STATUSES and attempt < self.max_retries:
+                    delay = self._retry_delay(response, attempt)
+                else:
+                    data = None
+                    if decode and status == 200:
+                        data = json_loads(await response.read())
+                    return status, data, response.headers
+
+            if delay is None:
+                _LOGGER.debug("Cuby token rejected, re-authenticating")
+                reauthenticated = True
+                if not await self._async_refresh_token(token):
+                    return 401, None, {}
+                continue
+
+            attempt += 1
+            self.metrics.endpoint(path).retries += 1
+            _LOGGER.debug(
+                "Cuby API returned %s for %s, retry %d in %.1fs",
+                status,
+                path,
+                attempt,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
     async def get_devices(self) -> list:
         """Get list of Cuby devices."""
-        if not self.token:
-            if not await self.authenticate():
-                return []
-
         try:
-            url = "https://cuby.cloud/api/v2/devices"
-            headers = {"Authorization": f"Bearer {self.token}"}
-            
-            async with self._session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
-                return []
+            status, data = await self._request("GET", "devices")
+            if status == 200:
+                return [
+                    pick_fields(device, CubyDevice.PAYLOAD_FIELDS) for device in data
+                ]
+            return []
         except Exception as err:
             _LOGGER.error("Error getting devices: %s", err)
             return []
 
     async def get_device_state(self, device_id: str) -> dict:
-        """Get the current state of a device."""
-        if not self.token:
-            if not await self.authenticate():
-                return {}
-
+        """Get the current state of a device, after its queued writes."""
+        await self._async_wait_for_writes(device_id)
         try:
-            url = f"https://cuby.cloud/api/v2/devices/{device_id}/state"
-            headers = {"Authorization": f"Bearer {self.token}"}
-            
-            async with self._session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
-                return {}
+            status, data = await self._request(
+                "GET", f"devices/{device_id}/state", device_id=device_id
+            )
+            if status == 200:
+                return pick_fields(data, CubyDeviceState.FIELDS)
+            return {}
         except Exception as err:
             _LOGGER.error("Error getting device state: %s", err)
             return {}
 
     async def set_device_state(self, device_id: str, state: dict) -> bool:
         """Set the state of a device."""
-        if not self.token:
-            if not await self.authenticate():
-                return False
-
         try:
-            url = f"https://cuby.cloud/api/v2/devices/{device_id}/state"
-            headers = {"Authorization": f"Bearer {self.token}"}
-            
-            async with self._session.post(url, headers=headers, json=state) as response:
-                return response.status == 200
+            status, _ = await self._request(
+                "POST",
+                f"devices/{device_id}/state",
+                decode=False,
+                device_id=device_id,
+                json=state,
+            )
+            return status == 200
         except Exception as err:
             _LOGGER.error("Error setting device state: %s", err)
             return False
 
+    async def queue_device_state(self, device_id: str, state: dict) -> bool:
+        """Queue a state change and send it together with its neighbours.
+
+        Writes to a device are sent one at a time, in the order they were
+        queued, each with a per-device sequence number. Changes keep merging
+        into the next write, later values overriding earlier ones, until it
+        is its turn to be sent. A write in flight whose every value has been
+        overridden is cancelled. Every caller receives the result of the
+        request that carried its latest values.
+        """
+        pending = self._pending_commands.get(device_id)
+        if pending is None:
+            seq = self._write_seqs[device_id] = self._write_seqs.get(device_id, 0) + 1
+            pending = _CubyWrite(seq, asyncio.get_running_loop().create_future())
+            self._pending_commands[device_id] = pending
+            self._flush_tasks[device_id] = asyncio.create_task(
+                self._async_flush_commands(device_id)
+            )
+        pending.state.update(state)
+
+        inflight = self._inflight_writes.get(device_id)
+        if (
+            inflight is not None
+            and inflight.superseded_by is None
+            and inflight.state.keys() <= pending.state.keys()
+        ):
+            _LOGGER.debug(
+                "Write #%s to device %s superseded by #%s",
+                inflight.seq,
+                device_id,
+                pending.seq,
+            )
+            inflight.superseded_by = pending
+            inflight.task.cancel()
+        return await asyncio.shield(pending.future)
+
+    async def _async_flush_commands(self, device_id: str) -> None:
+        """Send the merged changes of a device once it is their turn."""
+        await asyncio.sleep(self.command_debounce)
+        async with self._write_locks.setdefault(device_id, asyncio.Lock()):
+            write = self._pending_commands.pop(device_id)
+            self._flush_tasks.pop(device_id, None)
+            _LOGGER.debug(
+                "Sending write #%s to device %s: %s", write.seq, device_id, write.state
+            )
+            write.task = asyncio.create_task(
+                self.set_device_state(device_id, write.state)
+            )
+            self._inflight_writes[device_id] = write
+            try:
+                await asyncio.wait({write.task})
+            except asyncio.CancelledError:
+                write.task.cancel()
+                raise
+            finally:
+                self._inflight_writes.pop(device_id, None)
+
+        if not write.task.cancelled():
+            result = write.task.result()
+        elif write.superseded_by is not None:
+            result = await asyncio.shield(write.superseded_by.future)
+        else:
+            result = False
+        if not write.future.done():
+            write.future.set_result(result)
+
+    async def _async_wait_for_writes(self, device_id: str) -> None:
+        """Wait until the writes queued for a device have been sent."""
+        futures = [
+            write.future
+            for write in (
+                self._inflight_writes.get(device_id),
+                self._pending_commands.get(device_id),
+            )
+            if write is not None
+        ]
+        if futures:
+            await asyncio.wait(futures)
+
     async def discover_devices(self) -> list:
         """Discover and return all available devices."""
         devices = await self.get_devices()
-        discovered = []
-        
-        for device in devices:
+        data = await self.get_devices_data(
+            [device["id"] for device in devices], include_info=False
+        )
+        return [
+            CubyDevice(device["id"], device, data[device["id"]].state)
+            for device in devices
+            if device["id"] in data
+        ]
+
+    async def get_devices_data(
+        self, device_ids: list, include_info: bool = True
+    ) -> dict:
+        """Fetch the state, and optionally info, of many devices concurrently.
+
+        At most ``max_concurrency`` requests are in flight at once and each
+        HTTP exchange is bounded by ``request_timeout``, so a slow or failing
+        device only leaves its own fields empty. The Cuby v2 API has no
+        multi-device state endpoint, so every device is fetched individually.
+
+        Returns a ``CubyDevice`` per device ID, parsed once here so entities
+        can share it. Devices left empty because a circuit breaker is open,
+        rather than because a request failed, are in ``short_circuited``.
+        """
+        if not await self._async_ensure_token():
+            return {}
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        requests = {"state": self.get_device_state}
+        if include_info:
+            requests["info"] = self.get_device_info
+
+        keys = [
+            (device_id, key) for device_id in device_ids for key in requests
+        ]
+        results = await asyncio.gather(
+            *(
+                self._fetch_bounded(semaphore, requests[key], device_id)
+                for device_id, key in keys
+            )
+        )
+
+        raw = {device_id: {} for device_id in device_ids}
+        for (device_id, key), result in zip(keys, results):
+            raw[device_id][key] = result
+            if key == "state" and not result:
+                # The cached info may claim a device is online that no longer
+                # answers; fetch it afresh on the next poll.
+                self.cache.invalidate(f"devices/{device_id}")
+        return {
+            device_id: CubyDevice(
+                device_id,
+                payloads.get("info"),
+                CubyDeviceState.from_dict(payloads["state"]),
+                CubyCapabilities.from_info(payloads["info"])
+                if payloads.get("info")
+                else None,
+            )
+            for device_id, payloads in raw.items()
+        }
+
+    async def _fetch_bounded(
+        self, semaphore: asyncio.Semaphore, request, device_id: str
+    ) -> dict:
+        """Run a single device request under the concurrency limit."""
+        async with semaphore:
             try:
-                state = await self.get_device_state(device["id"])
-                device["state"] = state
-                discovered.append(device)
+                return await request(device_id)
             except Exception as err:
-                _LOGGER.error("Error discovering device %s: %s", device.get("id"), err)
-                
-        return discovered
+                _LOGGER.error("Error fetching data for device %s: %s", device_id, err)
+            return {}
 
     async def get_device_info(self, device_id: str) -> dict:
         """Get detailed device information."""
-        if not self.token:
-            if not await self.authenticate():
-                return {}
-
         try:
-            url = f"https://cuby.cloud/api/v2/devices/{device_id}"
-            headers = {"Authorization": f"Bearer {self.token}"}
-            
-            async with self._session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
-                return {}
+            status, data = await self._request(
+                "GET", f"devices/{device_id}", device_id=device_id
+            )
+            if status == 200:
+                return pick_fields(data, CubyDevice.PAYLOAD_FIELDS)
+            return {}
         except Exception as err:
             _LOGGER.error("Error getting device info: %s", err)
             return {}
 
     async def set_ac_power(self, device_id: str, power: bool) -> bool:
         """Turn the AC on or off."""
-        return await self.set_device_state(device_id, {"power": power})
+        return await self.queue_device_state(device_id, {"power": power})
 
     async def set_ac_temperature(self, device_id: str, temperature: float) -> bool:
         """Set the target temperature."""
-        # Ensure temperature is within valid range (16-30°C)
-        temp = min(max(temperature, 16), 30)
-        return await self.set_device_state(device_id, {"temperature": temp})
+        # Ensure temperature is within the range the API accepts
+        temp = min(max(temperature, MIN_TEMPERATURE), MAX_TEMPERATURE)
+        return await self.queue_device_state(device_id, {"temperature": temp})
 
     async def set_ac_mode(self, device_id: str, mode: str) -> bool:
         """Set the AC operation mode."""
-        valid_modes = ["auto", "cool", "heat", "dry", "fan_only"]
-        if mode not in valid_modes:
-            _LOGGER.error("Invalid mode: %s. Must be one of %s", mode, valid_modes)
+        if mode not in HVAC_MODES:
+            _LOGGER.error(
+                "Invalid mode: %s. Must be one of %s", mode, sorted(HVAC_MODES.cuby_modes)
+            )
             return False
-        return await self.set_device_state(device_id, {"mode": mode})
+        return await self.queue_device_state(device_id, {"mode": mode})
 
     async def set_ac_fan_mode(self, device_id: str, fan_mode: str) -> bool:
         """Set the fan mode."""
-        valid_fan_modes = ["auto", "low", "medium", "high"]
-        if fan_mode not in valid_fan_modes:
-            _LOGGER.error("Invalid fan mode: %s. Must be one of %s", fan_mode, valid_fan_modes)
+        if fan_mode not in FAN_MODES:
+            _LOGGER.error(
+                "Invalid fan mode: %s. Must be one of %s",
+                fan_mode,
+                sorted(FAN_MODES.cuby_modes),
+            )
             return False
-        return await self.set_device_state(device_id, {"fan_mode": fan_mode})
+        return await self.queue_device_state(device_id, {"fan_mode": fan_mode})
 
     async def set_ac_swing_mode(self, device_id: str, swing_mode: str) -> bool:
         """Set the swing mode."""
-        valid_swing_modes = ["off", "vertical", "horizontal", "both"]
-        if swing_mode not in valid_swing_modes:
-            _LOGGER.error("Invalid swing mode: %s. Must be one of %s", swing_mode, valid_swing_modes)
+        if swing_mode not in SWING_MODES:
+            _LOGGER.error(
+                "Invalid swing mode: %s. Must be one of %s",
+                swing_mode,
+                sorted(SWING_MODES.cuby_modes),
+            )
             return False
-        return await self.set_device_state(device_id, {"swing": swing_mode})
+        return await self.queue_device_state(device_id, {"swing": swing_mode})
 
-    async def set_ac_full_state(self, device_id: str, state: dict) -> bool:
-        """Set multiple AC parameters at once."""
+    @staticmethod
+    def _filter_state(state: dict) -> dict | None:
+        """Return the supported parameters of a state, or None if invalid."""
         valid_keys = {"power", "temperature", "mode", "fan_mode", "swing"}
         filtered_state = {k: v for k, v in state.items() if k in valid_keys}
-        
+
         if not filtered_state:
             _LOGGER.error("No valid parameters provided")
+            return None
+
+        for key, modes in COMMAND_MODES.items():
+            if key in filtered_state and filtered_state[key] not in modes:
+                _LOGGER.error("Invalid %s: %s", key, filtered_state[key])
+                return None
+        return filtered_state
+
+    async def set_ac_full_state(self, device_id: str, state: dict) -> bool:
+        """Set multiple AC parameters at once."""
+        if (filtered_state := self._filter_state(state)) is None:
             return False
-            
-        return await self.set_device_state(device_id, filtered_state)
+        return await self.queue_device_state(device_id, filtered_state)
+
+    async def set_group_state(
+        self, device_ids: list, state: dict, attempts: int = GROUP_COMMAND_ATTEMPTS
+    ) -> dict[str, bool]:
+        """Send the same state to many devices and return each one's result.
+
+        Commands run concurrently, at most ``max_concurrency`` at a time and
+        paced by the rate limiter. The Cuby v2 API has no bulk endpoint, so
+        every device gets its own request. Failed devices are retried with
+        backoff, up to ``attempts`` rounds in total; devices that succeeded
+        are not sent the command again.
+        """
+        results = dict.fromkeys(device_ids, False)
+        if (filtered_state := self._filter_state(state)) is None:
+            return results
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def send(device_id: str) -> bool:
+            async with semaphore:
+                return await self.queue_device_state(device_id, filtered_state)
+
+        pending = list(results)
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(_backoff_delay(attempt))
+            outcomes = await asyncio.gather(*(send(device_id) for device_id in pending))
+            results.update(zip(pending, outcomes))
+            pending = [device_id for device_id in pending if not results[device_id]]
+            if not pending:
+                break
+            _LOGGER.debug("Retrying group command for %s", pending)
+        return results
+
+class CubyAccountManager:
+    """Manage the API clients of every configured Cuby account.
+
+    All accounts share Home Assistant's connection pool, while each keeps its
+    own token, rate limit budget and metrics. Every account is given a poll
+    phase so the device polls of different accounts interleave.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the account manager."""
+        self._session = async_get_clientsession(hass)
+        self.accounts: dict[str, CubyAPI] = {}
+        self._slots: dict[str, int] = {}
+
+    @callback
+    def async_add_account(
+        self,
+        entry_id: str,
+        username: str,
+        password: str,
+        expiration: int = 0,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        rate_burst: int = DEFAULT_RATE_BURST,
+    ) -> CubyAPI:
+        """Create the API client of an account."""
+        api = CubyAPI(
+            username,
+            password,
+            expiration,
+            session=self._session,
+            rate_limit=rate_limit,
+            rate_burst=rate_burst,
+        )
+        used = set(self._slots.values())
+        self._slots[entry_id] = next(
+            slot for slot in range(len(used) + 1) if slot not in used
+        )
+        self.accounts[entry_id] = api
+        return api
+
+    def poll_phase(self, entry_id: str) -> float:
+        """Return the poll phase of an account, between 0 and 1.
+
+        Slots map to 0, 1/2, 1/4, 3/4, ... so the phases stay evenly spread
+        however many accounts are added.
+        """
+        slot, phase, step = self._slots.get(entry_id, 0), 0.0, 0.5
+        while slot:
+            if slot & 1:
+                phase += step
+            slot >>= 1
+            step /= 2
+        return phase
+
+    async def async_remove_account(self, entry_id: str) -> None:
+        """Close the API client of an account and free its poll slot."""
+        self._slots.pop(entry_id, None)
+        if api := self.accounts.pop(entry_id, None):
+            await api.async_close()
+
+    def diagnostics(self) -> dict:
+        """Return a summary of every account's requests for diagnostics."""
+        return {
+            entry_id: {
+                "requests": api.metrics.total("requests"),
+                "errors": api.metrics.total("errors"),
+                "average_latency": api.metrics.average_latency,
+                "rate_limit": api.rate_limiter.rate,
+                "poll_phase": self.poll_phase(entry_id),
+            }
+            for entry_id, api in self.accounts.items()
+        }
+
+@callback
+def async_get_account_manager(hass: HomeAssistant) -> CubyAccountManager:
+    """Return the account manager, creating it on first use."""
+    if DATA_ACCOUNTS not in hass.data:
+        hass.data[DATA_ACCOUNTS] = CubyAccountManager(hass)
+    return hass.data[DATA_ACCOUNTS]
+
+@callback
+def async_cache_devices(hass: HomeAssistant, username: str, devices: list) -> None:
+    """Remember the device list discovered for an account."""
+    hass.data.setdefault(DATA_DEVICE_CACHE, {})[username] = (time.monotonic(), devices)
+
+@callback
+def async_get_cached_devices(hass: HomeAssistant, username: str) -> list | None:
+    """Return the devices discovered for an account within the TTL."""
+    cached = hass.data.get(DATA_DEVICE_CACHE, {}).get(username)
+    if cached and time.monotonic() - cached[0] < DEVICE_CACHE_TTL:
+        return cached[1]
+    return None
+
+async def async_get_devices(hass: HomeAssistant, api: CubyAPI) -> list:
+    """Return the account's devices, reusing a discovery younger than the TTL.
+
+    The config flow and entry reloads seed this cache, so setting up an entry
+    does not repeat a device discovery that has just been made.
+    """
+    if cached := async_get_cached_devices(hass, api.username):
+        return cached
+
+    devices = await api.get_devices()
+    if devices:
+        async_cache_devices(hass, api.username, devices)
+    return devices
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Cuby component."""
     _LOGGER.debug("Setting up Cuby integration")
-    
+    async_setup_services(hass)
+
     if DOMAIN not in config:
         return True
 
@@ -225,7 +948,9 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     if expiration == 0:
         _LOGGER.warning("Token expiration is set to 0, this might cause issues")
 
-    api = CubyAPI(username, password, expiration)
+    api = CubyAPI(
+        username, password, expiration, session=async_get_clientsession(hass)
+    )
     if not await api.authenticate():
         _LOGGER.error("Failed to authenticate with Cuby API")
         return False
@@ -241,26 +966,108 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Cuby from a config entry."""
-    api = CubyAPI(
+    """Set up Cuby from a config entry.
+
+    When an earlier run cached the devices, the entities are created from the
+    cache at once and the cloud is queried in the background.
+    """
+    manager = async_get_account_manager(hass)
+    api = manager.async_add_account(
+        entry.entry_id,
         entry.data[CONF_USERNAME],
         entry.data[CONF_PASSWORD],
-        entry.data.get(CONF_EXPIRATION, 0)
+        entry.data.get(CONF_EXPIRATION, 0),
+        rate_limit=entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+        rate_burst=entry.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
     )
+    store = CubyStore(hass, entry.entry_id)
+    cached = await store.async_load()
+    api.restore_token(cached["token"])
+    devices = async_get_cached_devices(hass, api.username) or cached["devices"]
+    restored = {
+        device["id"]: cached["data"][device["id"]]
+        for device in devices
+        if device["id"] in cached["data"]
+    }
 
-    if not await api.authenticate():
-        return False
+    try:
+        if not restored:
+            if api.token is None and not await api.authenticate():
+                await manager.async_remove_account(entry.entry_id)
+                return False
+            devices = await async_get_devices(hass, api)
+        coordinator = CubyDataUpdateCoordinator(
+            hass,
+            api,
+            devices,
+            temperature_deadband=entry.options.get(
+                CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND
+            ),
+            poll_phase=manager.poll_phase(entry.entry_id),
+        )
+        coordinator.capabilities.update(cached["capabilities"])
+        if restored:
+            coordinator.data = restored
+        else:
+            await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await manager.async_remove_account(entry.entry_id)
+        raise
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = api
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+
+    @callback
+    def _async_save() -> None:
+        store.async_save(coordinator)
+
+    _async_save()
+    entry.async_on_unload(coordinator.async_add_listener(_async_save))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    if restored:
+        entry.async_create_background_task(
+            hass,
+            _async_refresh_restored_entry(hass, entry, coordinator),
+            f"{DOMAIN} refresh {entry.entry_id}",
+        )
 
     return True
 
+async def _async_refresh_restored_entry(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: CubyDataUpdateCoordinator
+) -> None:
+    """Refresh an entry set up from the cache and pick up device changes.
+
+    Capabilities of models missing from the cache are read from the info
+    the refresh polls, so startup does not wait for them.
+    """
+    await coordinator.async_refresh()
+    devices = await coordinator.api.get_devices()
+    if not devices:
+        return
+
+    async_cache_devices(hass, coordinator.api.username, devices)
+    if {device["id"] for device in devices} != {
+        device["id"] for device in coordinator.devices
+    }:
+        _LOGGER.info("Cuby devices changed, reloading %s", entry.title)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        await async_get_account_manager(hass).async_remove_account(entry.entry_id)
+
+    return unload_ok
 
-    return unload_ok
\ No newline at end of file
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the cache of a removed config entry."""
+    await CubyStore(hass, entry.entry_id).async_remove()
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""Circuit breakers for the Cuby integration."""
+from __future__ import annotations
+
+import time
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CubyCircuitBreaker:
+    """Stop calling a failing target until a cool-down has passed.
+
+    After ``threshold`` consecutive failures the breaker opens and rejects
+    calls at once. Once ``cooldown`` seconds have passed a single probe is
+    let through; its success closes the breaker, its failure reopens it.
+    """
+
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        """Initialize the circuit breaker."""
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Return True if a call may be made now."""
+        if self.state == STATE_CLOSED:
+            return True
+        # An open breaker lets a single probe through per cool-down, which
+        # also replaces a probe that never reported back.
+        if time.monotonic() - self._opened_at < self.cooldown:
+            return False
+        self.state = STATE_HALF_OPEN
+        self._opened_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self.state = STATE_CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker when needed."""
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN or self.failures >= self.threshold:
+            self.state = STATE_OPEN
+            self._opened_at = time.monotonic()
+
+    def as_dict(self) -> dict:
+        """Return the breaker state for diagnostics."""
+        return {"state": self.state, "failures": self.failures}
@@ -0,0 +1,97 @@
+"""Response caching for the Cuby integration."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .metrics import endpoint_name
+
+
+class CubyCacheEntry:
+    """A cached response body with its validators."""
+
+    __slots__ = ("data", "expires", "etag", "last_modified")
+
+    def __init__(
+        self,
+        data: Any,
+        expires: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Initialize the entry."""
+        self.data = data
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self) -> bool:
+        """Return True if the entry can be served without asking the server."""
+        return time.monotonic() < self.expires
+
+    def validators(self) -> dict[str, str]:
+        """Return the headers revalidating this entry with the server."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CubyResponseCache:
+    """LRU cache of GET responses, with a time to live per endpoint.
+
+    Endpoints are named as in the request metrics, e.g. ``devices/{id}``.
+    Endpoints without a TTL are not cached. Once ``max_entries`` responses are
+    held, the least recently used one is evicted.
+    """
+
+    def __init__(self, ttls: dict[str, float], max_entries: int) -> None:
+        """Initialize the cache."""
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CubyCacheEntry] = OrderedDict()
+
+    def ttl(self, path: str) -> float:
+        """Return how long responses of ``path`` may be served from cache."""
+        return self.ttls.get(endpoint_name(path), 0)
+
+    def get(self, path: str) -> CubyCacheEntry | None:
+        """Return the cached entry of ``path``, fresh or not."""
+        entry = self._entries.get(path)
+        if entry is not None:
+            self._entries.move_to_end(path)
+        return entry
+
+    def store(
+        self,
+        path: str,
+        data: Any,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Cache a response of ``path``."""
+        self._entries[path] = CubyCacheEntry(
+            data, time.monotonic() + self.ttl(path), etag, last_modified
+        )
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def renew(self, path: str) -> None:
+        """Keep serving an entry the server confirmed is unchanged."""
+        if entry := self._entries.get(path):
+            entry.expires = time.monotonic() + self.ttl(path)
+
+    def invalidate(self, path: str) -> None:
+        """Drop the cached response of ``path``."""
+        self._entries.pop(path, None)
+
+    def as_dict(self) -> dict:
+        """Return the cache statistics for diagnostics."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
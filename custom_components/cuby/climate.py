@@ -2,55 +2,40 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional
+from typing import Any
 
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import (
     ClimateEntityFeature,
     HVACMode,
     FAN_AUTO,
-    FAN_LOW,
-    FAN_MEDIUM,
-    FAN_HIGH,
+    SWING_OFF,
 )
 from homeassistant.const import (
     ATTR_TEMPERATURE,
     UnitOfTemperature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import DOMAIN, CubyAPI
+from . import DOMAIN
+from .modes import HVAC_MODES, FAN_MODES, SWING_MODES
+from .coordinator import CubyDataUpdateCoordinator
+from .models import CubyCapabilities
 
 _LOGGER = logging.getLogger(__name__)
 
-HVAC_MODES = {
-    "off": HVACMode.OFF,
-    "cool": HVACMode.COOL,
-    "heat": HVACMode.HEAT,
-    "auto": HVACMode.AUTO,
-    "dry": HVACMode.DRY,
-    "fan_only": HVACMode.FAN_ONLY,
-}
-
-FAN_MODES = {
-    "auto": FAN_AUTO,
-    "low": FAN_LOW,
-    "medium": FAN_MEDIUM,
-    "high": FAN_HIGH,
-}
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Cuby climate platform from a config entry."""
-    api = hass.data[DOMAIN][entry.entry_id]
-    _LOGGER.debug("Fetching Cuby devices...")
-    devices = await api.get_devices()
-    
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    devices = coordinator.devices
+
     if not devices:
         _LOGGER.error("No Cuby devices found")
         return
@@ -60,100 +45,173 @@ async def async_setup_entry(
     entities = []
     for device in devices:
         _LOGGER.info("Adding Cuby device: %s", device.get("name", device["id"]))
-        entities.append(CubyClimate(api, device))
+        entities.append(CubyClimate(coordinator, device))
     
     async_add_entities(entities)
 
-class CubyClimate(ClimateEntity):
+class CubyClimate(CoordinatorEntity[CubyDataUpdateCoordinator], ClimateEntity):
     """Representation of a Cuby climate device."""
 
     _attr_has_entity_name = True
     _enable_turn_on_off_backwards_compatibility = False
 
-    def __init__(self, api: CubyAPI, device: dict):
+    def __init__(self, coordinator: CubyDataUpdateCoordinator, device: dict):
         """Initialize the climate device."""
-        self._api = api
+        super().__init__(coordinator)
+        self._api = coordinator.api
         self._device = device
         self._attr_unique_id = device["id"]
         self._attr_name = device.get("name", f"Cuby AC {device['id']}")
-        self._attr_supported_features = (
-            ClimateEntityFeature.TARGET_TEMPERATURE
-            | ClimateEntityFeature.FAN_MODE
-            | ClimateEntityFeature.TURN_ON
-            | ClimateEntityFeature.TURN_OFF
-        )
-        self._attr_hvac_modes = list(HVAC_MODES.values())
-        self._attr_fan_modes = list(FAN_MODES.values())
+        self._apply_capabilities(coordinator.device_capabilities(device))
         self._attr_temperature_unit = UnitOfTemperature.CELSIUS
-        self._attr_min_temp = 16
-        self._attr_max_temp = 30
-        self._attr_target_temperature_step = 1
         self._attr_hvac_mode = HVACMode.OFF
         self._attr_current_temperature = None
         self._attr_target_temperature = None
         self._attr_fan_mode = FAN_AUTO
-        self._state = {}
-
-    async def async_added_to_hass(self) -> None:
-        """Run when entity about to be added to hass."""
-        await super().async_added_to_hass()
-        await self.async_update()
-
-    async def async_update(self) -> None:
-        """Update the entity."""
-        try:
-            self._state = await self._api.get_device_state(self._device["id"])
-            if self._state:
-                self._attr_current_temperature = self._state.get("current_temperature")
-                self._attr_target_temperature = self._state.get("target_temperature")
-                self._attr_hvac_mode = HVAC_MODES.get(
-                    self._state.get("mode", "off"), HVACMode.OFF
-                )
-                self._attr_fan_mode = FAN_MODES.get(
-                    self._state.get("fan_mode", "auto"), FAN_AUTO
-                )
-        except Exception as err:
-            _LOGGER.error("Error updating climate entity: %s", err)
-            self._attr_available = False
+        self._attr_swing_mode = SWING_OFF
+        self._state = None
+        self._update_from_state()
+
+    def _apply_capabilities(self, capabilities: CubyCapabilities) -> None:
+        """Build the supported features and modes from the device's model."""
+        self._capabilities = capabilities
+        self._attr_supported_features = (
+            ClimateEntityFeature.TARGET_TEMPERATURE
+            | ClimateEntityFeature.TURN_ON
+            | ClimateEntityFeature.TURN_OFF
+        )
+        if capabilities.fan_modes:
+            self._attr_supported_features |= ClimateEntityFeature.FAN_MODE
+        if capabilities.swing_modes:
+            self._attr_supported_features |= ClimateEntityFeature.SWING_MODE
+        self._attr_hvac_modes = [
+            HVACMode.OFF,
+            *(HVAC_MODES.to_ha(mode) for mode in capabilities.modes),
+        ]
+        self._attr_fan_modes = [
+            FAN_MODES.to_ha(mode) for mode in capabilities.fan_modes
+        ]
+        self._attr_swing_modes = [
+            SWING_MODES.to_ha(mode) for mode in capabilities.swing_modes
+        ]
+        self._attr_min_temp = capabilities.min_temperature
+        self._attr_max_temp = capabilities.max_temperature
+        self._attr_target_temperature_step = capabilities.temperature_step
+
+    @property
+    def available(self) -> bool:
+        """Return True if the coordinator has state for this device."""
+        return super().available and self._state is not None
+
+    def _update_from_state(self) -> None:
+        """Apply the coordinator's latest state for this device."""
+        device = (self.coordinator.data or {}).get(self._device["id"])
+        self._state = device.state if device else None
+        if self._state is not None:
+            # Ignore current temperature jitter smaller than the deadband.
+            current = self._state.current_temperature
+            if (
+                current is None
+                or self._attr_current_temperature is None
+                or abs(current - self._attr_current_temperature)
+                >= self.coordinator.temperature_deadband
+            ):
+                self._attr_current_temperature = current
+            self._attr_target_temperature = self._state.target_temperature
+            self._attr_hvac_mode = self._state.hvac_mode
+            self._attr_fan_mode = self._state.ha_fan_mode
+            self._attr_swing_mode = self._state.ha_swing_mode
+
+    def _tracked_values(self) -> tuple:
+        """Return the values whose change warrants a state write."""
+        return (
+            self.available,
+            self._attr_hvac_mode,
+            self._attr_fan_mode,
+            self._attr_swing_mode,
+            self._attr_target_temperature,
+            self._attr_current_temperature,
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, writing only on change.
+
+        Capabilities probed after the entity was created are applied too.
+        """
+        previous = self._tracked_values()
+        capabilities = self.coordinator.device_capabilities(self._device)
+        if capabilities != self._capabilities:
+            self._apply_capabilities(capabilities)
+            previous = None
+        self._update_from_state()
+        if self._tracked_values() != previous:
+            super()._handle_coordinator_update()
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature is None:
             return
+        if not self._capabilities.supports({"temperature": temperature}):
+            _LOGGER.error(
+                "Temperature %s is outside the range of %s", temperature, self.name
+            )
+            return
 
-        await self._api.set_ac_temperature(self._device["id"], temperature)
+        if await self._api.set_ac_temperature(self._device["id"], temperature):
+            self.coordinator.async_apply_optimistic_state(
+                self._device["id"], {"temperature": temperature}
+            )
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
-        mode = next(
-            (k for k, v in HVAC_MODES.items() if v == hvac_mode),
-            "off"
-        )
         if hvac_mode == HVACMode.OFF:
-            await self._api.set_ac_power(self._device["id"], False)
+            changes = {"power": False}
+            success = await self._api.set_ac_power(self._device["id"], False)
         else:
+            mode = HVAC_MODES.to_cuby(hvac_mode)
+            if mode not in self._capabilities.modes:
+                _LOGGER.error("Unsupported hvac mode: %s", hvac_mode)
+                return
             # Ensure the AC is on when changing modes
-            await self._api.set_ac_full_state(
-                self._device["id"],
-                {
-                    "power": True,
-                    "mode": mode
-                }
-            )
+            changes = {"power": True, "mode": mode}
+            success = await self._api.set_ac_full_state(self._device["id"], changes)
+        if success:
+            self.coordinator.async_apply_optimistic_state(self._device["id"], changes)
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set new target fan mode."""
-        mode = next(
-            (k for k, v in FAN_MODES.items() if v == fan_mode),
-            "auto"
-        )
-        await self._api.set_ac_fan_mode(self._device["id"], mode)
+        mode = FAN_MODES.to_cuby(fan_mode)
+        if mode not in self._capabilities.fan_modes:
+            _LOGGER.error("Unsupported fan mode: %s", fan_mode)
+            return
+        if await self._api.set_ac_fan_mode(self._device["id"], mode):
+            self.coordinator.async_apply_optimistic_state(
+                self._device["id"], {"fan_mode": mode}
+            )
+
+    async def async_set_swing_mode(self, swing_mode: str) -> None:
+        """Set new target swing mode."""
+        mode = SWING_MODES.to_cuby(swing_mode)
+        if mode not in self._capabilities.swing_modes:
+            _LOGGER.error("Unsupported swing mode: %s", swing_mode)
+            return
+        if await self._api.set_ac_swing_mode(self._device["id"], mode):
+            self.coordinator.async_apply_optimistic_state(
+                self._device["id"], {"swing": mode}
+            )
 
     async def async_turn_on(self) -> None:
         """Turn the entity on."""
-        await self._api.set_ac_power(self._device["id"], True)
+        if await self._api.set_ac_power(self._device["id"], True):
+            self.coordinator.async_apply_optimistic_state(
+                self._device["id"], {"power": True}
+            )
 
     async def async_turn_off(self) -> None:
         """Turn the entity off."""
-        await self._api.set_ac_power(self._device["id"], False)
\ No newline at end of file
+        if await self._api.set_ac_power(self._device["id"], False):
+            self.coordinator.async_apply_optimistic_state(
+                self._device["id"], {"power": False}
+            )
@@ -8,9 +8,19 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from . import DOMAIN, CubyAPI, CONF_EXPIRATION
+from . import DOMAIN, CubyAPI, CONF_EXPIRATION, async_cache_devices
+from .const import (
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_TEMPERATURE_DEADBAND,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_TEMPERATURE_DEADBAND,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +38,14 @@ class CubyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> CubyOptionsFlow:
+        """Get the options flow for this handler."""
+        return CubyOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -39,7 +57,8 @@ class CubyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 api = CubyAPI(
                     user_input[CONF_USERNAME],
                     user_input[CONF_PASSWORD],
-                    user_input.get(CONF_EXPIRATION, 0)
+                    user_input.get(CONF_EXPIRATION, 0),
+                    session=async_get_clientsession(self.hass),
                 )
 
                 if await api.authenticate():
@@ -50,6 +69,9 @@ class CubyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     else:
                         await self.async_set_unique_id(user_input[CONF_USERNAME])
                         self._abort_if_unique_id_configured()
+                        async_cache_devices(
+                            self.hass, user_input[CONF_USERNAME], devices
+                        )
                         
                         return self.async_create_entry(
                             title=user_input[CONF_USERNAME],
@@ -65,4 +87,39 @@ class CubyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=DATA_SCHEMA,
             errors=errors,
-        ) 
\ No newline at end of file
+        )
+
+class CubyOptionsFlow(config_entries.OptionsFlow):
+    """Handle Cuby options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    CONF_TEMPERATURE_DEADBAND,
+                    default=options.get(
+                        CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_RATE_LIMIT,
+                    default=options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+                vol.Optional(
+                    CONF_RATE_BURST,
+                    default=options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            }),
+        )
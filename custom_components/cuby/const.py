@@ -0,0 +1,65 @@
+"""Constants for the Cuby A/C Control integration."""
+from datetime import timedelta
+
+DOMAIN = "cuby"
+CONF_EXPIRATION = "expiration"
+
+DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_REQUEST_TIMEOUT = 10
+
+DATA_DEVICE_CACHE = f"{DOMAIN}_device_cache"
+DATA_ACCOUNTS = f"{DOMAIN}_accounts"
+DEVICE_CACHE_TTL = 300
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
+API_BASE_URL = "https://cuby.cloud/api/v2"
+TOKEN_REFRESH_MARGIN = 60
+
+DEFAULT_COMMAND_DEBOUNCE = 0.3
+
+RECONCILE_DELAY = 5
+
+POLL_TICK = timedelta(seconds=5)
+FAST_POLL_INTERVAL = 10
+FAST_POLL_WINDOW = 120
+IDLE_POLL_INTERVAL = 120
+OFFLINE_POLL_INTERVAL = 300
+# Failed polls in a row after which a device's last state is dropped.
+OFFLINE_FAILURE_THRESHOLD = 3
+
+# Seconds a GET response may be served from cache, per endpoint. Device info
+# carries the online status and WiFi signal, so it is kept no longer than the
+# fastest poll interval.
+DEFAULT_CACHE_TTLS = {"devices/{id}": FAST_POLL_INTERVAL}
+DEFAULT_CACHE_SIZE = 512
+
+DEFAULT_RATE_LIMIT = 10
+DEFAULT_RATE_BURST = 30
+DEFAULT_MAX_RETRIES = 3
+GROUP_COMMAND_ATTEMPTS = 3
+RETRY_BACKOFF_BASE = 1
+RETRY_BACKOFF_MAX = 30
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+BREAKER_FAILURE_THRESHOLD = 5
+DEVICE_BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN = 60
+
+# Estimated electrical draw, in kW, of a running unit per mode, scaled by fan speed.
+ESTIMATED_POWER = {"cool": 1.0, "heat": 1.2, "auto": 1.0, "dry": 0.6, "fan_only": 0.08}
+DEFAULT_ESTIMATED_POWER = 1.0
+FAN_POWER_FACTOR = {"auto": 1.0, "low": 0.8, "medium": 1.0, "high": 1.2}
+USAGE_UPDATE_INTERVAL = timedelta(minutes=1)
+
+MIN_TEMPERATURE = 16
+MAX_TEMPERATURE = 30
+TEMPERATURE_STEP = 1
+
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+DEFAULT_TEMPERATURE_DEADBAND = 0.5
+CONF_RATE_LIMIT = "rate_limit"
+CONF_RATE_BURST = "rate_burst"
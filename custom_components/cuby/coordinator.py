@@ -0,0 +1,295 @@
+"""Data update coordinator for the Cuby integration."""
+from __future__ import annotations
+
+import logging
+import math
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    DOMAIN,
+    DEFAULT_SCAN_INTERVAL,
+    RECONCILE_DELAY,
+    POLL_TICK,
+    FAST_POLL_INTERVAL,
+    FAST_POLL_WINDOW,
+    IDLE_POLL_INTERVAL,
+    OFFLINE_POLL_INTERVAL,
+    OFFLINE_FAILURE_THRESHOLD,
+    DEFAULT_TEMPERATURE_DEADBAND,
+)
+from .models import CubyCapabilities, CubyDevice
+
+if TYPE_CHECKING:
+    from . import CubyAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+# Command payload keys that are reported under a different key in the state.
+COMMAND_STATE_KEYS = {"temperature": "target_temperature"}
+
+
+class CubyPollScheduler:
+    """Decide when each device is next due for a poll.
+
+    Devices are polled quickly for a while after a command, at the normal
+    rate while running, and progressively less often when powered off or
+    offline. A failed poll is retried at the normal rate; only devices the
+    cloud reports offline, or that failed ``OFFLINE_FAILURE_THRESHOLD`` polls
+    in a row, fall back to the offline rate. Devices seen for the first time
+    are spread evenly over their interval so their requests do not arrive in
+    bursts. ``phase`` shifts that spread by a fraction of a slot, matching
+    the offset of the account's coordinator ticks.
+    """
+
+    def __init__(self, phase: float = 0) -> None:
+        """Initialize the scheduler."""
+        self.phase = phase
+        self._next_poll: dict[str, float] = {}
+        self._fast_until: dict[str, float] = {}
+        self.failures: dict[str, int] = {}
+
+    def due(self, device_ids: list, now: float) -> list:
+        """Return the devices that should be polled at ``now``."""
+        return [
+            device_id
+            for device_id in device_ids
+            if self._next_poll.get(device_id, 0) <= now
+        ]
+
+    def interval(self, device: CubyDevice, now: float) -> float:
+        """Return the poll interval of a device given its latest data."""
+        if (
+            device.online is False
+            or self.failures.get(device.id, 0) >= OFFLINE_FAILURE_THRESHOLD
+        ):
+            return OFFLINE_POLL_INTERVAL
+        if self._fast_until.get(device.id, 0) > now:
+            return FAST_POLL_INTERVAL
+        if device.state is None:
+            return DEFAULT_SCAN_INTERVAL.total_seconds()
+        if device.state.power is False:
+            return IDLE_POLL_INTERVAL
+        return DEFAULT_SCAN_INTERVAL.total_seconds()
+
+    def schedule(self, data: dict, now: float) -> None:
+        """Schedule the next poll of every device just polled."""
+        new_devices = [
+            device_id for device_id in data if device_id not in self._next_poll
+        ]
+        offsets = {
+            device_id: (index + 1 - self.phase) / len(new_devices)
+            for index, device_id in enumerate(new_devices)
+        }
+        for device_id, device in data.items():
+            if device.state is None:
+                self.failures[device_id] = self.failures.get(device_id, 0) + 1
+            else:
+                self.failures.pop(device_id, None)
+            interval = self.interval(device, now)
+            self._next_poll[device_id] = now + interval * offsets.get(device_id, 1)
+
+    def mark_active(self, device_id: str, now: float) -> None:
+        """Poll a device quickly because it has just been changed."""
+        self._fast_until[device_id] = now + FAST_POLL_WINDOW
+        self._next_poll[device_id] = min(
+            self._next_poll.get(device_id, now), now + FAST_POLL_INTERVAL
+        )
+
+
+class CubyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, CubyDevice]]):
+    """Fetch state and info for every device of an account once per cycle."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: CubyAPI,
+        devices: list,
+        temperature_deadband: float = DEFAULT_TEMPERATURE_DEADBAND,
+        poll_phase: float = 0,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=POLL_TICK,
+            always_update=False,
+        )
+        self.api = api
+        self.devices = devices
+        self.scheduler = CubyPollScheduler(poll_phase)
+        self.temperature_deadband = temperature_deadband
+        self._expected_states: dict[str, dict[str, Any]] = {}
+        self._unsub_device_refresh: dict[str, CALLBACK_TYPE] = {}
+        self._device_infos: dict[str, DeviceInfo] = {}
+        self.capabilities: dict[str, CubyCapabilities] = {}
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next tick in this account's slot of the poll grid.
+
+        Home Assistant starts every interval on a whole second, so accounts
+        set up together would tick at the same moment. Ticks are instead
+        placed the poll phase of an interval past each multiple of the
+        interval on the loop clock, so accounts stay interleaved however long
+        their refreshes take.
+        """
+        if self._update_interval_seconds is None:
+            return
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+        self._async_unsub_refresh()
+
+        loop = self.hass.loop
+        interval = self._update_interval_seconds
+        offset = self.scheduler.phase * interval
+        next_refresh = (
+            (math.floor((loop.time() - offset) / interval) + 1) * interval
+            + offset
+            + self._microsecond
+        )
+        self._unsub_refresh = loop.call_at(
+            next_refresh, self.hass.async_run_hass_job, self._job
+        ).cancel
+
+    async def _async_update_data(self) -> dict[str, CubyDevice]:
+        """Fetch the latest state and info of the devices due for a poll."""
+        now = time.monotonic()
+        due = self.scheduler.due([device["id"] for device in self.devices], now)
+        if not due and self.data is not None:
+            return self.data
+
+        fetched = await self.api.get_devices_data(due)
+        if not fetched:
+            raise UpdateFailed("Unable to fetch the state of any Cuby device")
+        self._async_learn_capabilities(fetched)
+        self.scheduler.schedule(fetched, now)
+        previous = self.data or {}
+        for device_id, device in fetched.items():
+            old = previous.get(device_id)
+            if (
+                device.state is not None
+                or old is None
+                or device_id in self.api.short_circuited
+                or self.scheduler.failures[device_id] >= OFFLINE_FAILURE_THRESHOLD
+            ):
+                continue
+            # Keep the last known state through a transient failure, but not
+            # while a circuit breaker is open and the cloud is treated as down.
+            if device.online is None:
+                fetched[device_id] = old
+            else:
+                device.state = old.state
+        data = {**previous, **fetched}
+
+        if self.devices and all(device.state is None for device in data.values()):
+            raise UpdateFailed("Unable to fetch the state of any Cuby device")
+
+        return data
+
+    def device_info(self, device: dict) -> DeviceInfo:
+        """Return the registry info of a device, shared by all its entities."""
+        if device["id"] not in self._device_infos:
+            self._device_infos[device["id"]] = DeviceInfo(
+                identifiers={(DOMAIN, device["id"])},
+                name=device.get("name", f"Cuby AC {device['id']}"),
+                manufacturer="Cuby",
+                model=device.get("model", "AC Controller"),
+                sw_version=device.get("firmware_version"),
+            )
+        return self._device_infos[device["id"]]
+
+    def device_capabilities(self, device: dict) -> CubyCapabilities:
+        """Return the capabilities of a device's model."""
+        return self.capabilities.get(device.get("model") or "") or CubyCapabilities()
+
+    @callback
+    def _async_learn_capabilities(self, fetched: dict[str, CubyDevice]) -> None:
+        """Keep the capabilities of models seen for the first time in a poll.
+
+        Every poll fetches device info, so a model whose info could not be
+        read yet is picked up on its devices' next poll. Listeners are told
+        at once, as the polled data may otherwise compare equal.
+        """
+        learned = False
+        for device in fetched.values():
+            model = device.model or ""
+            if device.capabilities is not None and model not in self.capabilities:
+                self.capabilities[model] = device.capabilities
+                learned = True
+        if learned and self.data is not None:
+            self.async_update_listeners()
+
+    @callback
+    def async_apply_optimistic_state(
+        self, device_id: str, changes: dict[str, Any]
+    ) -> None:
+        """Apply a command the cloud accepted to the cached state of a device.
+
+        Listeners see the new values at once, and a refresh of this device
+        alone is scheduled to confirm them.
+        """
+        device = (self.data or {}).get(device_id)
+        if device is None or device.state is None:
+            return
+
+        expected = {
+            COMMAND_STATE_KEYS.get(key, key): value for key, value in changes.items()
+        }
+        device.state = device.state.replace(**expected)
+        self._expected_states.setdefault(device_id, {}).update(expected)
+        self.scheduler.mark_active(device_id, time.monotonic())
+        self.async_update_listeners()
+        self._async_schedule_device_refresh(device_id)
+
+    @callback
+    def _async_schedule_device_refresh(self, device_id: str) -> None:
+        """Refresh a device once its commands have had time to apply."""
+        if unsub := self._unsub_device_refresh.pop(device_id, None):
+            unsub()
+
+        @callback
+        def _refresh(_now: Any) -> None:
+            self._unsub_device_refresh.pop(device_id, None)
+            self.hass.async_create_task(self.async_refresh_device(device_id))
+
+        self._unsub_device_refresh[device_id] = async_call_later(
+            self.hass,
+            RECONCILE_DELAY,
+            HassJob(_refresh, f"{DOMAIN} refresh {device_id}", cancel_on_shutdown=True),
+        )
+
+    async def async_refresh_device(self, device_id: str) -> None:
+        """Fetch the state of a single device and reconcile optimistic values."""
+        fetched = await self.api.get_devices_data([device_id], include_info=False)
+        expected = self._expected_states.pop(device_id, {})
+        device = (self.data or {}).get(device_id)
+        state = fetched[device_id].state if device_id in fetched else None
+        if state is None or device is None:
+            return
+
+        if rejected := {
+            key: value
+            for key, value in expected.items()
+            if getattr(state, key) != value
+        }:
+            _LOGGER.debug(
+                "Device %s did not apply %s, rolling back to the reported state",
+                device_id,
+                rejected,
+            )
+        device.state = state
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending device refreshes and shut down the coordinator."""
+        for unsub in self._unsub_device_refresh.values():
+            unsub()
+        self._unsub_device_refresh.clear()
+        await super().async_shutdown()
@@ -0,0 +1,26 @@
+"""Diagnostics support for the Cuby integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from . import DOMAIN, async_get_account_manager
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "data": async_redact_data(dict(entry.data), TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "api": coordinator.api.diagnostics(),
+        "accounts": async_get_account_manager(hass).diagnostics(),
+    }
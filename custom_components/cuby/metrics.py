@@ -0,0 +1,90 @@
+"""Request instrumentation for the Cuby integration."""
+from __future__ import annotations
+
+import re
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_DEVICE_PATH = re.compile(r"^devices/[^/]+")
+
+
+def endpoint_name(path: str) -> str:
+    """Return the endpoint template of a request path."""
+    if path.startswith("token/"):
+        return "token"
+    return _DEVICE_PATH.sub("devices/{id}", path)
+
+
+class CubyEndpointMetrics:
+    """Counters and latency histogram of a single endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the endpoint metrics."""
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.latency_total = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(
+        self, latency: float, size: int, error: bool, sent: int = 0
+    ) -> None:
+        """Record a completed request, ``size`` and ``sent`` being body sizes."""
+        self.requests += 1
+        self.errors += error
+        self.bytes_received += size
+        self.bytes_sent += sent
+        self.latency_total += latency
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                break
+        else:
+            index = len(LATENCY_BUCKETS)
+        self.latency_buckets[index] += 1
+
+    def as_dict(self) -> dict:
+        """Return the metrics for diagnostics."""
+        bounds = [f"<={bound}s" for bound in LATENCY_BUCKETS] + ["+Inf"]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_received": self.bytes_received,
+            "bytes_sent": self.bytes_sent,
+            "average_latency": (
+                self.latency_total / self.requests if self.requests else None
+            ),
+            "latency_histogram": dict(zip(bounds, self.latency_buckets)),
+        }
+
+
+class CubyMetrics:
+    """Per-endpoint request metrics of a Cuby API client."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: dict[str, CubyEndpointMetrics] = {}
+
+    def endpoint(self, path: str) -> CubyEndpointMetrics:
+        """Return the metrics of the endpoint serving ``path``."""
+        name = endpoint_name(path)
+        if name not in self.endpoints:
+            self.endpoints[name] = CubyEndpointMetrics()
+        return self.endpoints[name]
+
+    def total(self, key: str) -> int | float:
+        """Return a counter summed over every endpoint."""
+        return sum(getattr(metrics, key) for metrics in self.endpoints.values())
+
+    @property
+    def average_latency(self) -> float | None:
+        """Return the average latency of every request, in seconds."""
+        requests = self.total("requests")
+        return self.total("latency_total") / requests if requests else None
+
+    def as_dict(self) -> dict:
+        """Return the metrics for diagnostics."""
+        return {name: metrics.as_dict() for name, metrics in self.endpoints.items()}
@@ -0,0 +1,207 @@
+"""Device models for the Cuby integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.climate.const import HVACMode, FAN_AUTO, SWING_OFF
+
+from .const import MIN_TEMPERATURE, MAX_TEMPERATURE, TEMPERATURE_STEP
+from .modes import HVAC_MODES, FAN_MODES, SWING_MODES
+
+
+def pick_fields(payload: dict[str, Any], fields: tuple[str, ...]) -> dict[str, Any]:
+    """Return only the ``fields`` of a payload that the integration uses."""
+    return {field: payload[field] for field in fields if field in payload}
+
+
+class _CubyModel:
+    """Base class comparing models by their slots."""
+
+    __slots__ = ()
+
+    def _values(self) -> tuple:
+        """Return the values of every slot."""
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if both models hold the same values."""
+        return type(other) is type(self) and self._values() == other._values()
+
+    def __repr__(self) -> str:
+        """Return a readable representation of the model."""
+        values = ", ".join(
+            f"{slot}={getattr(self, slot)!r}" for slot in self.__slots__
+        )
+        return f"{type(self).__name__}({values})"
+
+
+class CubyDeviceState(_CubyModel):
+    """State reported by a Cuby device.
+
+    The Home Assistant HVAC, fan and swing modes are worked out once when the
+    state is parsed, so entities read them without any lookups.
+    """
+
+    FIELDS = (
+        "power",
+        "mode",
+        "target_temperature",
+        "current_temperature",
+        "fan_mode",
+        "swing",
+    )
+    __slots__ = FIELDS + ("hvac_mode", "ha_fan_mode", "ha_swing_mode")
+
+    def __init__(
+        self,
+        power: bool | None = None,
+        mode: str | None = None,
+        target_temperature: float | None = None,
+        current_temperature: float | None = None,
+        fan_mode: str | None = None,
+        swing: str | None = None,
+    ) -> None:
+        """Initialize the state."""
+        self.power = power
+        self.mode = mode
+        self.target_temperature = target_temperature
+        self.current_temperature = current_temperature
+        self.fan_mode = fan_mode
+        self.swing = swing
+        if power is False:
+            self.hvac_mode = HVACMode.OFF
+        else:
+            self.hvac_mode = HVAC_MODES.to_ha(mode, HVACMode.OFF)
+        self.ha_fan_mode = FAN_MODES.to_ha(fan_mode, FAN_AUTO)
+        self.ha_swing_mode = SWING_MODES.to_ha(swing, SWING_OFF)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CubyDeviceState | None:
+        """Parse a state payload, returning None when it is empty."""
+        if not data:
+            return None
+        return cls(*(data.get(field) for field in cls.FIELDS))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state as an API payload."""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def replace(self, **changes: Any) -> CubyDeviceState:
+        """Return a copy of the state with some values changed."""
+        return CubyDeviceState(**{**self.as_dict(), **changes})
+
+
+class CubyDevice(_CubyModel):
+    """A Cuby device with its latest info and state.
+
+    ``capabilities`` is only set on devices whose info was just polled; it is
+    not saved with ``as_dict``.
+    """
+
+    INFO_FIELDS = ("name", "model", "firmware_version", "online", "wifi_signal")
+    # Fields kept from device list and device info payloads.
+    PAYLOAD_FIELDS = ("id",) + INFO_FIELDS + ("capabilities",)
+    __slots__ = ("id",) + INFO_FIELDS + ("state", "capabilities")
+
+    def __init__(
+        self,
+        device_id: str,
+        info: dict[str, Any] | None = None,
+        state: CubyDeviceState | None = None,
+        capabilities: CubyCapabilities | None = None,
+    ) -> None:
+        """Initialize the device from its info payload."""
+        info = info or {}
+        self.id = device_id
+        self.name = info.get("name")
+        self.model = info.get("model")
+        self.firmware_version = info.get("firmware_version")
+        self.online = info.get("online")
+        self.wifi_signal = info.get("wifi_signal")
+        self.state = state
+        self.capabilities = capabilities
+
+    @classmethod
+    def from_dict(cls, device_id: str, data: dict[str, Any]) -> CubyDevice:
+        """Rebuild a device saved with ``as_dict``."""
+        return cls(
+            device_id,
+            data.get("info"),
+            CubyDeviceState.from_dict(data.get("state") or {}),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the device info and state as plain data."""
+        return {
+            "info": {field: getattr(self, field) for field in self.INFO_FIELDS},
+            "state": self.state.as_dict() if self.state is not None else None,
+        }
+
+
+class CubyCapabilities(_CubyModel):
+    """Modes and temperature range supported by a device model.
+
+    Read from the ``capabilities`` object of the device info. Anything it
+    does not list falls back to the full set the Cuby API accepts.
+    """
+
+    __slots__ = (
+        "modes",
+        "fan_modes",
+        "swing_modes",
+        "min_temperature",
+        "max_temperature",
+        "temperature_step",
+    )
+
+    def __init__(
+        self,
+        modes: list[str] | None = None,
+        fan_modes: list[str] | None = None,
+        swing_modes: list[str] | None = None,
+        min_temperature: float = MIN_TEMPERATURE,
+        max_temperature: float = MAX_TEMPERATURE,
+        temperature_step: float = TEMPERATURE_STEP,
+    ) -> None:
+        """Initialize the capabilities, keeping only modes the API knows."""
+        self.modes = HVAC_MODES.filter(HVAC_MODES.cuby_modes if modes is None else modes)
+        self.fan_modes = FAN_MODES.filter(
+            FAN_MODES.cuby_modes if fan_modes is None else fan_modes
+        )
+        self.swing_modes = SWING_MODES.filter(
+            SWING_MODES.cuby_modes if swing_modes is None else swing_modes
+        )
+        self.min_temperature = min_temperature
+        self.max_temperature = max_temperature
+        self.temperature_step = temperature_step
+
+    @classmethod
+    def from_info(cls, info: dict[str, Any]) -> CubyCapabilities:
+        """Parse the capabilities advertised in a device info payload."""
+        capabilities = info.get("capabilities") or {}
+        return cls(
+            capabilities.get("modes"),
+            capabilities.get("fan_modes"),
+            capabilities.get("swing_modes"),
+            capabilities.get("min_temperature", MIN_TEMPERATURE),
+            capabilities.get("max_temperature", MAX_TEMPERATURE),
+            capabilities.get("temperature_step", TEMPERATURE_STEP),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the capabilities as plain data."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def supports(self, state: dict[str, Any]) -> bool:
+        """Return True if a model accepts every value of a state command."""
+        for key, values in (
+            ("mode", self.modes),
+            ("fan_mode", self.fan_modes),
+            ("swing", self.swing_modes),
+        ):
+            if key in state and state[key] not in values:
+                return False
+        temperature = state.get("temperature")
+        return temperature is None or (
+            self.min_temperature <= temperature <= self.max_temperature
+        )
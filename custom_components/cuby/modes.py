@@ -0,0 +1,74 @@
+"""Translation between Cuby and Home Assistant climate modes."""
+from __future__ import annotations
+
+from homeassistant.components.climate.const import (
+    HVACMode,
+    FAN_AUTO,
+    FAN_LOW,
+    FAN_MEDIUM,
+    FAN_HIGH,
+    SWING_OFF,
+    SWING_VERTICAL,
+    SWING_HORIZONTAL,
+    SWING_BOTH,
+)
+
+
+class CubyModeMap:
+    """Precomputed two-way mapping between Cuby and Home Assistant modes."""
+
+    def __init__(self, modes: dict[str, str]) -> None:
+        """Initialize the mapping from Cuby modes to Home Assistant modes."""
+        self._to_ha = dict(modes)
+        self._to_cuby = {ha_mode: mode for mode, ha_mode in modes.items()}
+        self.cuby_modes = frozenset(modes)
+        self.ha_modes = list(modes.values())
+
+    def filter(self, modes) -> list[str]:
+        """Return the valid Cuby modes among ``modes``, in mapping order."""
+        return [mode for mode in self._to_ha if mode in modes]
+
+    def __contains__(self, mode: object) -> bool:
+        """Return True if ``mode`` is a valid Cuby mode."""
+        return mode in self._to_ha
+
+    def to_ha(self, mode: str | None, default: str | None = None) -> str | None:
+        """Return the Home Assistant mode of a Cuby mode."""
+        return self._to_ha.get(mode, default)
+
+    def to_cuby(self, ha_mode: str | None) -> str | None:
+        """Return the Cuby mode of a Home Assistant mode, or None if unknown."""
+        return self._to_cuby.get(ha_mode)
+
+
+# Powering off is a separate command, so "off" is not a Cuby operation mode.
+HVAC_MODES = CubyModeMap(
+    {
+        "cool": HVACMode.COOL,
+        "heat": HVACMode.HEAT,
+        "auto": HVACMode.AUTO,
+        "dry": HVACMode.DRY,
+        "fan_only": HVACMode.FAN_ONLY,
+    }
+)
+
+FAN_MODES = CubyModeMap(
+    {
+        "auto": FAN_AUTO,
+        "low": FAN_LOW,
+        "medium": FAN_MEDIUM,
+        "high": FAN_HIGH,
+    }
+)
+
+SWING_MODES = CubyModeMap(
+    {
+        "off": SWING_OFF,
+        "vertical": SWING_VERTICAL,
+        "horizontal": SWING_HORIZONTAL,
+        "both": SWING_BOTH,
+    }
+)
+
+# Keys of a state command whose values must be one of these modes.
+COMMAND_MODES = {"mode": HVAC_MODES, "fan_mode": FAN_MODES, "swing": SWING_MODES}
@@ -0,0 +1,55 @@
+"""Request rate limiting for the Cuby integration."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class CubyRateLimiter:
+    """Token bucket that hands out request slots, serving writes first.
+
+    Up to ``burst`` requests may be sent at once, after which slots refill
+    at ``rate`` per second. Reads wait while any write is waiting, so user
+    commands are not held up behind background polling. The server can
+    pause the whole bucket, e.g. when it answers with ``Retry-After``.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize the rate limiter."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting_writes = 0
+
+    def _refill(self, now: float) -> None:
+        """Add the slots earned since the last refill."""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, write: bool = False) -> None:
+        """Wait until a request may be sent."""
+        if write:
+            self._waiting_writes += 1
+        try:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens < 1:
+                    delay = (1 - self._tokens) / self.rate
+                elif not write and self._waiting_writes:
+                    delay = 1 / self.rate
+                else:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep(delay)
+        finally:
+            if write:
+                self._waiting_writes -= 1
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for ``seconds``."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
@@ -2,9 +2,12 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+import time
+from datetime import datetime
+from typing import Any
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorEntity,
     SensorDeviceClass,
     SensorStateClass,
@@ -12,92 +15,294 @@ from homeassistant.components.sensor import (
 from homeassistant.const import (
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
     PERCENTAGE,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfTime,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 from . import DOMAIN, CubyAPI
+from .const import (
+    ESTIMATED_POWER,
+    DEFAULT_ESTIMATED_POWER,
+    FAN_POWER_FACTOR,
+    USAGE_UPDATE_INTERVAL,
+)
+from .coordinator import CubyDataUpdateCoordinator
+from .models import CubyDevice, CubyDeviceState
 
 _LOGGER = logging.getLogger(__name__)
 
+# Account level request metrics: key, name, unit and whether it is a counter.
+API_METRICS = [
+    ("requests", "API Requests", None, True),
+    ("errors", "API Errors", None, True),
+    ("retries", "API Retries", None, True),
+    ("bytes_received", "API Data Received", UnitOfInformation.BYTES, True),
+    ("bytes_sent", "API Data Sent", UnitOfInformation.BYTES, True),
+    ("average_latency", "API Average Latency", UnitOfTime.MILLISECONDS, False),
+]
+
+# Per device usage totals: key, name, unit and device class.
+USAGE_SENSORS = [
+    ("runtime", "Runtime", UnitOfTime.HOURS, SensorDeviceClass.DURATION),
+    (
+        "energy",
+        "Estimated Energy",
+        UnitOfEnergy.KILO_WATT_HOUR,
+        SensorDeviceClass.ENERGY,
+    ),
+]
+
+# Usage periods and the suffix of their sensor names.
+USAGE_PERIODS = {None: "", "day": " Today", "month": " This Month"}
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Cuby sensor platform from a config entry."""
-    api = hass.data[DOMAIN][entry.entry_id]
-    devices = await api.discover_devices()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
     
     entities = []
-    for device in devices:
+    for device in coordinator.devices:
         entities.extend([
-            CubyWiFiSensor(api, device),
-            CubyOnlineSensor(api, device),
-            CubyModeSensor(api, device),
+            CubyWiFiSensor(coordinator, device),
+            CubyOnlineSensor(coordinator, device),
+            CubyModeSensor(coordinator, device),
         ])
+        entities.extend(
+            CubyUsageSensor(coordinator, device, *usage, period)
+            for usage in USAGE_SENSORS
+            for period in USAGE_PERIODS
+        )
+    for metric in API_METRICS:
+        entities.append(CubyApiMetricSensor(coordinator.api, entry, *metric))
     
     async_add_entities(entities)
 
-class CubyBaseSensor(SensorEntity):
+class CubyBaseSensor(CoordinatorEntity[CubyDataUpdateCoordinator], SensorEntity):
     """Base class for Cuby sensors."""
 
-    def __init__(self, api: CubyAPI, device: dict):
+    def __init__(self, coordinator: CubyDataUpdateCoordinator, device: dict):
         """Initialize the sensor."""
-        self._api = api
+        super().__init__(coordinator)
         self._device = device
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, device["id"])},
-            "name": device.get("name", f"Cuby AC {device['id']}"),
-            "manufacturer": "Cuby",
-            "model": device.get("model", "AC Controller"),
-            "sw_version": device.get("firmware_version"),
-        }
+        self._attr_device_info = coordinator.device_info(device)
+        self._update_from_data()
+
+    @property
+    def available(self) -> bool:
+        """Return True if the coordinator has state for this device."""
+        device = self._cuby_device
+        return super().available and device is not None and device.state is not None
+
+    @property
+    def _cuby_device(self) -> CubyDevice | None:
+        """Return the coordinator's latest data for this device."""
+        return (self.coordinator.data or {}).get(self._device["id"])
+
+    def _update_from_data(self) -> None:
+        """Apply the coordinator's latest data for this device."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, writing only on change."""
+        previous = (self.available, self._attr_native_value)
+        self._update_from_data()
+        if (self.available, self._attr_native_value) != previous:
+            super()._handle_coordinator_update()
 
 class CubyWiFiSensor(CubyBaseSensor):
     """Representation of Cuby WiFi strength sensor."""
 
-    def __init__(self, api: CubyAPI, device: dict):
+    def __init__(self, coordinator: CubyDataUpdateCoordinator, device: dict):
         """Initialize the WiFi sensor."""
-        super().__init__(api, device)
+        super().__init__(coordinator, device)
         self._attr_unique_id = f"{device['id']}_wifi"
         self._attr_name = f"{device.get('name', 'Cuby AC')} WiFi Signal"
         self._attr_device_class = SensorDeviceClass.SIGNAL_STRENGTH
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_native_unit_of_measurement = SIGNAL_STRENGTH_DECIBELS_MILLIWATT
 
-    async def async_update(self) -> None:
-        """Update the sensor."""
-        info = await self._api.get_device_info(self._device["id"])
-        if info:
-            self._attr_native_value = info.get("wifi_signal")
+    def _update_from_data(self) -> None:
+        """Apply the coordinator's latest info for this device."""
+        if device := self._cuby_device:
+            self._attr_native_value = device.wifi_signal
 
 class CubyOnlineSensor(CubyBaseSensor):
     """Representation of Cuby online status sensor."""
 
-    def __init__(self, api: CubyAPI, device: dict):
+    def __init__(self, coordinator: CubyDataUpdateCoordinator, device: dict):
         """Initialize the online status sensor."""
-        super().__init__(api, device)
+        super().__init__(coordinator, device)
         self._attr_unique_id = f"{device['id']}_online"
         self._attr_name = f"{device.get('name', 'Cuby AC')} Online Status"
 
-    async def async_update(self) -> None:
-        """Update the sensor."""
-        info = await self._api.get_device_info(self._device["id"])
-        if info:
-            self._attr_native_value = "online" if info.get("online", False) else "offline"
+    def _update_from_data(self) -> None:
+        """Apply the coordinator's latest info for this device."""
+        if (device := self._cuby_device) and device.online is not None:
+            self._attr_native_value = "online" if device.online else "offline"
 
 class CubyModeSensor(CubyBaseSensor):
     """Representation of Cuby operation mode sensor."""
 
-    def __init__(self, api: CubyAPI, device: dict):
+    def __init__(self, coordinator: CubyDataUpdateCoordinator, device: dict):
         """Initialize the mode sensor."""
-        super().__init__(api, device)
+        super().__init__(coordinator, device)
         self._attr_unique_id = f"{device['id']}_mode"
         self._attr_name = f"{device.get('name', 'Cuby AC')} Mode"
 
+    def _update_from_data(self) -> None:
+        """Apply the coordinator's latest state for this device."""
+        if (device := self._cuby_device) and device.state is not None:
+            self._attr_native_value = device.state.mode or "unknown"
+
+def _estimated_power(state: CubyDeviceState) -> float:
+    """Return the estimated draw of a running device, in kW."""
+    power = ESTIMATED_POWER.get(state.mode, DEFAULT_ESTIMATED_POWER)
+    return power * FAN_POWER_FACTOR.get(state.fan_mode, 1.0)
+
+def _period_key(period: str | None, now: datetime) -> Any:
+    """Return a key that changes whenever a new usage period starts."""
+    if period == "day":
+        return now.date()
+    if period == "month":
+        return (now.year, now.month)
+    return None
+
+class CubyUsageSensor(CubyBaseSensor, RestoreSensor):
+    """Running total of a device's runtime or estimated energy use.
+
+    Each update adds the time since the previous one, at the rate implied by
+    the previous state, so the total never has to be rebuilt from history.
+    Totals are restored after a restart, and period sensors start again from
+    zero each day or month.
+    """
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        coordinator: CubyDataUpdateCoordinator,
+        device: dict,
+        key: str,
+        name: str,
+        unit: str,
+        device_class: SensorDeviceClass,
+        period: str | None = None,
+    ):
+        """Initialize the usage sensor."""
+        self._key = key
+        self._period = period
+        self._period_key = _period_key(period, dt_util.now())
+        self._total = 0.0
+        self._rate_state: CubyDeviceState | None = None
+        self._since: float | None = None
+        super().__init__(coordinator, device)
+        suffix = f"_{period}" if period else ""
+        self._attr_unique_id = f"{device['id']}_{key}{suffix}"
+        self._attr_name = (
+            f"{device.get('name', 'Cuby AC')} {name}{USAGE_PERIODS[period]}"
+        )
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_entity_registry_enabled_default = period is None
+
+    @property
+    def available(self) -> bool:
+        """Return True, as the running total is known even while offline."""
+        return True
+
+    def _rate(self, state: CubyDeviceState) -> float:
+        """Return how fast the total grows per hour in ``state``."""
+        if not state.power:
+            return 0.0
+        if self._key == "runtime":
+            return 1.0
+        return _estimated_power(state)
+
+    def _update_from_data(self) -> None:
+        """Add the usage since the previous update to the total."""
+        now = time.monotonic()
+        if (key := _period_key(self._period, dt_util.now())) != self._period_key:
+            self._period_key = key
+            self._total = 0.0
+        if self._rate_state is not None and self._since is not None:
+            self._total += (now - self._since) / 3600 * self._rate(self._rate_state)
+
+        device = self._cuby_device
+        self._rate_state = (
+            device.state if device and self.coordinator.last_update_success else None
+        )
+        self._since = now
+        self._attr_native_value = round(self._total, 3)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the total and keep it growing between polls."""
+        await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        last_data = await self.async_get_last_sensor_data()
+        if (
+            last_state is not None
+            and last_data is not None
+            and last_data.native_value is not None
+            and _period_key(self._period, dt_util.as_local(last_state.last_updated))
+            == self._period_key
+        ):
+            self._total += float(last_data.native_value)
+            self._attr_native_value = round(self._total, 3)
+
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_handle_tick, USAGE_UPDATE_INTERVAL
+            )
+        )
+
+    @callback
+    def _async_handle_tick(self, _now: datetime) -> None:
+        """Account for usage while the device state does not change."""
+        self._handle_coordinator_update()
+
+class CubyApiMetricSensor(SensorEntity):
+    """Representation of a Cuby API request metric."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        api: CubyAPI,
+        entry: ConfigEntry,
+        key: str,
+        name: str,
+        unit: str | None,
+        counter: bool,
+    ):
+        """Initialize the metric sensor."""
+        self._api = api
+        self._key = key
+        self._attr_unique_id = f"{entry.entry_id}_api_{key}"
+        self._attr_name = f"{entry.title} {name}"
+        self._attr_native_unit_of_measurement = unit
+        if unit == UnitOfInformation.BYTES:
+            self._attr_device_class = SensorDeviceClass.DATA_SIZE
+        elif unit == UnitOfTime.MILLISECONDS:
+            self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = (
+            SensorStateClass.TOTAL_INCREASING if counter else SensorStateClass.MEASUREMENT
+        )
+
     async def async_update(self) -> None:
-        """Update the sensor."""
-        state = await self._api.get_device_state(self._device["id"])
-        if state:
-            self._attr_native_value = state.get("mode", "unknown")
+        """Read the metric from the API client."""
+        metrics = self._api.metrics
+        if self._key == "average_latency":
+            latency = metrics.average_latency
+            self._attr_native_value = None if latency is None else round(latency * 1000, 1)
+        else:
+            self._attr_native_value = metrics.total(self._key)
@@ -0,0 +1,113 @@
+"""Services for the Cuby integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN, MIN_TEMPERATURE, MAX_TEMPERATURE
+from .coordinator import CubyDataUpdateCoordinator
+from .modes import HVAC_MODES, FAN_MODES, SWING_MODES
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SET_GROUP_STATE = "set_group_state"
+ATTR_DEVICE_IDS = "device_ids"
+STATE_KEYS = ("power", "mode", "temperature", "fan_mode", "swing")
+
+SET_GROUP_STATE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_DEVICE_IDS): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional("power"): cv.boolean,
+            vol.Optional("mode"): vol.In(sorted(HVAC_MODES.cuby_modes)),
+            vol.Optional("temperature"): vol.All(
+                vol.Coerce(float), vol.Range(min=MIN_TEMPERATURE, max=MAX_TEMPERATURE)
+            ),
+            vol.Optional("fan_mode"): vol.In(sorted(FAN_MODES.cuby_modes)),
+            vol.Optional("swing"): vol.In(sorted(SWING_MODES.cuby_modes)),
+        }
+    ),
+    cv.has_at_least_one_key(*STATE_KEYS),
+)
+
+
+@callback
+def _async_get_coordinators(hass: HomeAssistant) -> list[CubyDataUpdateCoordinator]:
+    """Return the coordinators of the loaded config entries.
+
+    A YAML setup stores its bare ``CubyAPI`` under the domain instead.
+    """
+    entries = hass.data.get(DOMAIN)
+    if not isinstance(entries, dict):
+        return []
+    return [
+        coordinator
+        for coordinator in entries.values()
+        if isinstance(coordinator, CubyDataUpdateCoordinator)
+    ]
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Cuby services."""
+
+    async def async_set_group_state(call: ServiceCall) -> ServiceResponse:
+        """Send one state to many devices, across every configured account."""
+        state = {key: call.data[key] for key in STATE_KEYS if key in call.data}
+        coordinators: dict[str, CubyDataUpdateCoordinator] = {}
+        devices: dict[str, dict] = {}
+        for coordinator in _async_get_coordinators(hass):
+            for device in coordinator.devices:
+                coordinators[device["id"]] = coordinator
+                devices[device["id"]] = device
+
+        results: dict[str, dict] = {}
+        groups: dict[CubyDataUpdateCoordinator, list[str]] = {}
+        for device_id in dict.fromkeys(call.data[ATTR_DEVICE_IDS]):
+            if (coordinator := coordinators.get(device_id)) is None:
+                results[device_id] = {"success": False, "error": "unknown_device"}
+            elif not coordinator.device_capabilities(devices[device_id]).supports(state):
+                results[device_id] = {"success": False, "error": "unsupported"}
+            else:
+                groups.setdefault(coordinator, []).append(device_id)
+
+        outcomes = await asyncio.gather(
+            *(
+                coordinator.api.set_group_state(device_ids, state)
+                for coordinator, device_ids in groups.items()
+            )
+        )
+        for coordinator, outcome in zip(groups, outcomes):
+            for device_id, success in outcome.items():
+                results[device_id] = {"success": success}
+                if success:
+                    coordinator.async_apply_optimistic_state(device_id, state)
+
+        failed = [
+            device_id for device_id, result in results.items() if not result["success"]
+        ]
+        if failed:
+            _LOGGER.warning("Group command failed for devices %s", failed)
+            if not call.return_response:
+                raise HomeAssistantError(f"Failed to update Cuby devices {failed}")
+        return {"results": results} if call.return_response else None
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_GROUP_STATE,
+        async_set_group_state,
+        schema=SET_GROUP_STATE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
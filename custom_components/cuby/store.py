@@ -0,0 +1,66 @@
+"""Persistent cache of Cuby accounts."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_VERSION, STORAGE_SAVE_DELAY
+from .models import CubyCapabilities, CubyDevice
+
+if TYPE_CHECKING:
+    from .coordinator import CubyDataUpdateCoordinator
+
+
+class CubyStore:
+    """Persist an account's devices, their data, capabilities and token.
+
+    Loading the cache lets a config entry create its entities at startup
+    without waiting for the cloud.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store of a config entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}", private=True
+        )
+
+    async def async_load(self) -> dict[str, Any]:
+        """Return the cached devices, device data and token."""
+        stored = await self._store.async_load() or {}
+        return {
+            "devices": stored.get("devices") or [],
+            "data": {
+                device_id: CubyDevice.from_dict(device_id, device)
+                for device_id, device in (stored.get("data") or {}).items()
+            },
+            "token": stored.get("token"),
+            "capabilities": {
+                model: CubyCapabilities(**capabilities)
+                for model, capabilities in (stored.get("capabilities") or {}).items()
+            },
+        }
+
+    @callback
+    def async_save(self, coordinator: CubyDataUpdateCoordinator) -> None:
+        """Save the coordinator's latest data, batching frequent updates."""
+        self._store.async_delay_save(
+            lambda: {
+                "devices": coordinator.devices,
+                "data": {
+                    device_id: device.as_dict()
+                    for device_id, device in (coordinator.data or {}).items()
+                },
+                "token": coordinator.api.export_token(),
+                "capabilities": {
+                    model: capabilities.as_dict()
+                    for model, capabilities in coordinator.capabilities.items()
+                },
+            },
+            STORAGE_SAVE_DELAY,
+        )
+
+    async def async_remove(self) -> None:
+        """Delete the cache."""
+        await self._store.async_remove()
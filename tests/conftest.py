@@ -1,9 +1,9 @@
 """Global fixtures for Cuby integration tests."""
 import pytest
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock
 
 from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
-from custom_components.cuby import DOMAIN, CONF_EXPIRATION
+from custom_components.cuby import DOMAIN, CONF_EXPIRATION, CubyAPI
 
 pytest_plugins = "pytest_homeassistant_custom_component"
 
@@ -44,4 +44,13 @@ def mock_device_state():
         "current_temperature": 26,
         "fan_mode": "auto",
         "swing": "off"
-    } 
\ No newline at end of file
+    }
+
+@pytest.fixture
+def mock_api(mock_device, mock_device_state):
+    """Provide a Cuby API client with mocked endpoints."""
+    api = CubyAPI("test@example.com", "test_password")
+    api.token = "test_token"
+    api.get_device_state = AsyncMock(return_value=mock_device_state)
+    api.get_device_info = AsyncMock(return_value=mock_device)
+    return api
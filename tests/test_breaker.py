@@ -0,0 +1,39 @@
+"""Test the Cuby circuit breaker."""
+from unittest.mock import patch
+import pytest
+from custom_components.cuby.breaker import (
+    CubyCircuitBreaker,
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+)
+
+def test_breaker_opens_and_recovers():
+    """Test the breaker opens after repeated failures and recovers via a probe."""
+    breaker = CubyCircuitBreaker(threshold=2, cooldown=60)
+    with patch("custom_components.cuby.breaker.time.monotonic", return_value=0):
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+        assert not breaker.allow()
+
+    with patch("custom_components.cuby.breaker.time.monotonic", return_value=61):
+        assert breaker.allow()
+        assert breaker.state == STATE_HALF_OPEN
+        assert not breaker.allow()
+        breaker.record_success()
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow()
+
+def test_failed_probe_reopens():
+    """Test a failing probe reopens the breaker for another cool-down."""
+    breaker = CubyCircuitBreaker(threshold=1, cooldown=60)
+    with patch("custom_components.cuby.breaker.time.monotonic", return_value=0):
+        breaker.record_failure()
+    with patch("custom_components.cuby.breaker.time.monotonic", return_value=61):
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+        assert not breaker.allow()
@@ -0,0 +1,19 @@
+"""Test the Cuby response cache."""
+from custom_components.cuby.cache import CubyResponseCache
+
+def test_cache_ttls_and_lru_eviction():
+    """Test only endpoints with a TTL are cached, evicting the least recently used."""
+    cache = CubyResponseCache({"devices/{id}": 60}, max_entries=2)
+
+    assert cache.ttl("devices/a") == 60
+    assert cache.ttl("devices/a/state") == 0
+
+    cache.store("devices/a", {"id": "a"}, etag='"1"')
+    cache.store("devices/b", {"id": "b"})
+    cache.get("devices/a")
+    cache.store("devices/c", {"id": "c"})
+
+    assert cache.get("devices/b") is None
+    assert cache.get("devices/a").fresh
+    assert cache.get("devices/a").validators() == {"If-None-Match": '"1"'}
+    assert cache.get("devices/c").data == {"id": "c"}
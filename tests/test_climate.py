@@ -2,46 +2,171 @@
 from unittest.mock import patch, MagicMock, AsyncMock
 import pytest
 from homeassistant.components.climate.const import (
+    ClimateEntityFeature,
     HVACMode,
+    SWING_BOTH,
+    SWING_OFF,
 )
 from homeassistant.const import (
     ATTR_TEMPERATURE,
     UnitOfTemperature,
 )
 from custom_components.cuby.climate import CubyClimate
+from custom_components.cuby.coordinator import CubyDataUpdateCoordinator
+from custom_components.cuby.models import CubyDevice, CubyDeviceState
 
-async def test_climate_update(hass, mock_device, mock_device_state):
+async def test_climate_update(hass, mock_api, mock_device, mock_device_state):
     """Test climate entity updates."""
-    api = MagicMock()
-    api.get_device_state.return_value = mock_device_state
-    api.get_device_state = AsyncMock(return_value=mock_device_state)
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    await coordinator.async_refresh()
     
-    climate = CubyClimate(api, mock_device)
-    await climate.async_update()
+    climate = CubyClimate(coordinator, mock_device)
     
+    assert climate.available
     assert climate.hvac_mode == HVACMode.COOL
     assert climate.current_temperature == mock_device_state["current_temperature"]
     assert climate.target_temperature == mock_device_state["target_temperature"]
+    mock_api.get_device_state.assert_called_once_with(mock_device["id"])
 
-async def test_set_temperature(hass, mock_device):
+async def test_set_temperature(hass, mock_api, mock_device):
     """Test setting temperature."""
-    api = MagicMock()
-    api.set_ac_temperature = AsyncMock(return_value=True)
+    mock_api.set_ac_temperature = AsyncMock(return_value=True)
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
     
-    climate = CubyClimate(api, mock_device)
+    climate = CubyClimate(coordinator, mock_device)
     await climate.async_set_temperature(**{ATTR_TEMPERATURE: 25})
     
-    api.set_ac_temperature.assert_called_once_with(mock_device["id"], 25)
+    mock_api.set_ac_temperature.assert_called_once_with(mock_device["id"], 25)
+    await coordinator.async_shutdown()
 
-async def test_set_hvac_mode(hass, mock_device):
+async def test_set_hvac_mode(hass, mock_api, mock_device):
     """Test setting HVAC mode."""
-    api = MagicMock()
-    api.set_ac_full_state = AsyncMock(return_value=True)
+    mock_api.set_ac_full_state = AsyncMock(return_value=True)
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
     
-    climate = CubyClimate(api, mock_device)
+    climate = CubyClimate(coordinator, mock_device)
     await climate.async_set_hvac_mode(HVACMode.HEAT)
     
-    api.set_ac_full_state.assert_called_once_with(
+    mock_api.set_ac_full_state.assert_called_once_with(
         mock_device["id"],
         {"power": True, "mode": "heat"}
-    ) 
\ No newline at end of file
+    )
+    await coordinator.async_shutdown()
+
+async def test_set_swing_mode(hass, mock_api, mock_device):
+    """Test setting the swing mode."""
+    mock_api.set_ac_swing_mode = AsyncMock(return_value=True)
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    await coordinator.async_refresh()
+
+    climate = CubyClimate(coordinator, mock_device)
+    climate.async_write_ha_state = MagicMock()
+    coordinator.async_add_listener(climate._handle_coordinator_update)
+    assert climate.swing_mode == SWING_OFF
+    await climate.async_set_swing_mode(SWING_BOTH)
+
+    mock_api.set_ac_swing_mode.assert_called_once_with(mock_device["id"], "both")
+    assert climate.swing_mode == SWING_BOTH
+    await coordinator.async_shutdown()
+
+async def test_unknown_mode_is_rejected(hass, mock_api, mock_device):
+    """Test unknown modes are rejected without calling the API."""
+    mock_api.queue_device_state = AsyncMock(return_value=True)
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+
+    climate = CubyClimate(coordinator, mock_device)
+    await climate.async_set_hvac_mode(HVACMode.HEAT_COOL)
+    await climate.async_set_fan_mode("turbo")
+    await climate.async_set_swing_mode("diagonal")
+
+    mock_api.queue_device_state.assert_not_called()
+
+async def test_capabilities_drive_features(hass, mock_api, mock_device):
+    """Test features and limits follow the model's probed capabilities."""
+    mock_api.get_device_info = AsyncMock(return_value={
+        **mock_device,
+        "capabilities": {
+            "modes": ["cool", "dry"],
+            "swing_modes": [],
+            "min_temperature": 18,
+            "max_temperature": 28,
+        },
+    })
+    mock_api.queue_device_state = AsyncMock(return_value=True)
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    await coordinator.async_refresh()
+
+    climate = CubyClimate(coordinator, mock_device)
+
+    assert mock_api.get_device_info.call_count == 1
+    assert climate.hvac_modes == [HVACMode.OFF, HVACMode.COOL, HVACMode.DRY]
+    assert not climate.supported_features & ClimateEntityFeature.SWING_MODE
+    assert (climate.min_temp, climate.max_temp) == (18, 28)
+
+    await climate.async_set_hvac_mode(HVACMode.HEAT)
+    await climate.async_set_temperature(**{ATTR_TEMPERATURE: 30})
+    mock_api.queue_device_state.assert_not_called()
+
+async def test_optimistic_state_and_rollback(hass, mock_api, mock_device, mock_device_state):
+    """Test accepted commands apply at once and are reconciled per device."""
+    mock_api.set_ac_power = AsyncMock(return_value=True)
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    await coordinator.async_refresh()
+    climate = CubyClimate(coordinator, mock_device)
+
+    await climate.async_turn_off()
+
+    assert CubyClimate(coordinator, mock_device).hvac_mode == HVACMode.OFF
+    assert mock_api.get_device_state.call_count == 1
+
+    # The device still reports itself as on, so the optimistic value is dropped.
+    await coordinator.async_refresh_device(mock_device["id"])
+
+    assert CubyClimate(coordinator, mock_device).hvac_mode == HVACMode.COOL
+    assert mock_api.get_device_state.call_count == 2
+    assert mock_api.get_device_info.call_count == 1
+    await coordinator.async_shutdown()
+
+async def test_failed_command_is_not_applied(hass, mock_api, mock_device):
+    """Test a rejected command leaves the cached state untouched."""
+    mock_api.set_ac_temperature = AsyncMock(return_value=False)
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    await coordinator.async_refresh()
+    climate = CubyClimate(coordinator, mock_device)
+
+    await climate.async_set_temperature(**{ATTR_TEMPERATURE: 18})
+
+    assert CubyClimate(coordinator, mock_device).target_temperature == 24
+
+async def test_unchanged_state_is_not_written(hass, mock_api, mock_device, mock_device_state):
+    """Test polls only write state when a tracked value moves past the deadband."""
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    await coordinator.async_refresh()
+    climate = CubyClimate(coordinator, mock_device)
+    climate.async_write_ha_state = MagicMock()
+    coordinator.async_add_listener(climate._handle_coordinator_update)
+
+    coordinator.async_set_updated_data(
+        {
+            mock_device["id"]: CubyDevice(
+                mock_device["id"],
+                mock_device,
+                CubyDeviceState.from_dict({**mock_device_state, "current_temperature": 26.3}),
+            )
+        }
+    )
+    assert climate.current_temperature == 26
+    climate.async_write_ha_state.assert_not_called()
+
+    coordinator.async_set_updated_data(
+        {
+            mock_device["id"]: CubyDevice(
+                mock_device["id"],
+                mock_device,
+                CubyDeviceState.from_dict({**mock_device_state, "current_temperature": 26.6}),
+            )
+        }
+    )
+    assert climate.current_temperature == 26.6
+    climate.async_write_ha_state.assert_called_once()
+    await coordinator.async_shutdown()
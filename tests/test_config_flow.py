@@ -3,7 +3,15 @@ from unittest.mock import patch
 import pytest
 from homeassistant import config_entries, data_entry_flow
 from custom_components.cuby.config_flow import CubyConfigFlow
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 from custom_components.cuby import DOMAIN
+from custom_components.cuby.const import (
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_TEMPERATURE_DEADBAND,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+)
 
 async def test_flow_user_init(hass):
     """Test the initialization of the form in the first step of the config flow."""
@@ -33,4 +41,22 @@ async def test_flow_user_invalid_auth(hass, mock_config):
         )
 
     assert result["type"] == data_entry_flow.RESULT_TYPE_FORM
-    assert result["errors"] == {"base": "invalid_auth"} 
\ No newline at end of file
+    assert result["errors"] == {"base": "invalid_auth"}
+
+async def test_options_flow(hass, mock_config):
+    """Test the temperature deadband can be configured."""
+    entry = MockConfigEntry(domain=DOMAIN, data=mock_config)
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == data_entry_flow.RESULT_TYPE_FORM
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={CONF_TEMPERATURE_DEADBAND: 0.2}
+    )
+    assert result["type"] == data_entry_flow.RESULT_TYPE_CREATE_ENTRY
+    assert entry.options == {
+        CONF_TEMPERATURE_DEADBAND: 0.2,
+        CONF_RATE_LIMIT: DEFAULT_RATE_LIMIT,
+        CONF_RATE_BURST: DEFAULT_RATE_BURST,
+    }
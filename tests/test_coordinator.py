@@ -0,0 +1,145 @@
+"""Test the Cuby data update coordinator."""
+import asyncio
+import time
+from unittest.mock import patch
+import pytest
+from custom_components.cuby.coordinator import (
+    CubyDataUpdateCoordinator,
+    CubyPollScheduler,
+)
+from custom_components.cuby.models import CubyDevice, CubyDeviceState
+from custom_components.cuby.const import (
+    FAST_POLL_INTERVAL,
+    IDLE_POLL_INTERVAL,
+    OFFLINE_FAILURE_THRESHOLD,
+    OFFLINE_POLL_INTERVAL,
+    POLL_TICK,
+)
+
+def test_scheduler_intervals(mock_device, mock_device_state):
+    """Test devices are polled faster when active and slower when idle."""
+    scheduler = CubyPollScheduler()
+    state = CubyDeviceState.from_dict(mock_device_state)
+    running = CubyDevice("a", mock_device, state)
+    idle = CubyDevice("a", mock_device, state.replace(power=False))
+    offline = CubyDevice("a", {**mock_device, "online": False}, state)
+
+    assert scheduler.interval(running, 0) == 30
+    assert scheduler.interval(idle, 0) == IDLE_POLL_INTERVAL
+    assert scheduler.interval(offline, 0) == OFFLINE_POLL_INTERVAL
+    assert scheduler.interval(CubyDevice("a"), 0) == 30
+
+    scheduler.failures["a"] = OFFLINE_FAILURE_THRESHOLD
+    assert scheduler.interval(CubyDevice("a"), 0) == OFFLINE_POLL_INTERVAL
+    scheduler.failures.clear()
+
+    scheduler.mark_active("a", 0)
+    assert scheduler.interval(idle, 10) == FAST_POLL_INTERVAL
+
+def test_scheduler_spreads_new_devices(mock_device, mock_device_state):
+    """Test devices seen together are spread evenly over their interval."""
+    scheduler = CubyPollScheduler()
+    data = {
+        device_id: CubyDevice(
+            device_id, mock_device, CubyDeviceState.from_dict(mock_device_state)
+        )
+        for device_id in ("a", "b", "c")
+    }
+
+    scheduler.schedule(data, 0)
+
+    assert scheduler.due(list(data), 10) == ["a"]
+    assert scheduler.due(list(data), 20) == ["a", "b"]
+    assert scheduler.due(list(data), 30) == ["a", "b", "c"]
+
+def test_scheduler_phase_interleaves_accounts(mock_device, mock_device_state):
+    """Test a phase shifts the spread so accounts do not poll together."""
+    state = CubyDeviceState.from_dict(mock_device_state)
+    first = CubyPollScheduler()
+    second = CubyPollScheduler(phase=0.5)
+
+    first.schedule({"a": CubyDevice("a", mock_device, state)}, 0)
+    second.schedule({"b": CubyDevice("b", mock_device, state)}, 0)
+
+    assert first.due(["a"], 15) == []
+    assert second.due(["b"], 15) == ["b"]
+    assert first.due(["a"], 30) == ["a"]
+
+async def test_coordinators_interleave_ticks(hass, mock_api, mock_device):
+    """Test coordinators of different phases never tick together."""
+    first = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    second = CubyDataUpdateCoordinator(hass, mock_api, [mock_device], poll_phase=0.5)
+    first._microsecond = second._microsecond = 0
+    for coordinator in (first, second):
+        coordinator.async_add_listener(lambda: None)
+
+    for _ in range(3):
+        await asyncio.gather(first.async_refresh(), second.async_refresh())
+        ticks = [
+            coordinator._unsub_refresh.__self__.when() for coordinator in (first, second)
+        ]
+        assert ticks[0] % POLL_TICK.total_seconds() == pytest.approx(0, abs=1e-6)
+        assert (ticks[1] - ticks[0]) % POLL_TICK.total_seconds() == pytest.approx(2.5)
+
+    await first.async_shutdown()
+    await second.async_shutdown()
+
+async def test_coordinator_polls_only_due_devices(hass, mock_api, mock_device):
+    """Test a refresh skips devices whose next poll is not due yet."""
+    other = {**mock_device, "id": "other_device_id"}
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device, other])
+    with patch("custom_components.cuby.coordinator.time.monotonic", return_value=0):
+        await coordinator.async_refresh()
+    assert mock_api.get_device_state.call_count == 2
+
+    with patch("custom_components.cuby.coordinator.time.monotonic", return_value=20):
+        await coordinator.async_refresh()
+    assert mock_api.get_device_state.call_count == 3
+    assert set(coordinator.data) == {mock_device["id"], "other_device_id"}
+
+    with patch("custom_components.cuby.coordinator.time.monotonic", return_value=21):
+        await coordinator.async_refresh()
+    assert mock_api.get_device_state.call_count == 3
+
+async def test_coordinator_keeps_state_through_failures(hass, mock_api, mock_device):
+    """Test a failed poll keeps the last state until failures repeat."""
+    other = {**mock_device, "id": "other_device_id"}
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device, other])
+    device_id = mock_device["id"]
+    with patch("custom_components.cuby.coordinator.time.monotonic", return_value=0):
+        await coordinator.async_refresh()
+    state = coordinator.data[device_id].state
+
+    healthy = mock_api.get_device_state.return_value
+    mock_api.get_device_state.side_effect = lambda requested: (
+        {} if requested == device_id else healthy
+    )
+    now = 0
+    for _ in range(OFFLINE_FAILURE_THRESHOLD - 1):
+        now += 30
+        with patch("custom_components.cuby.coordinator.time.monotonic", return_value=now):
+            await coordinator.async_refresh()
+        assert coordinator.data[device_id].state == state
+        assert coordinator.scheduler.due([device_id], now + 30) == [device_id]
+
+    now += 30
+    with patch("custom_components.cuby.coordinator.time.monotonic", return_value=now):
+        await coordinator.async_refresh()
+    assert coordinator.data[device_id].state is None
+    assert coordinator.scheduler.due([device_id], now + 30) == []
+
+async def test_capabilities_learned_on_later_poll(hass, mock_api, mock_device):
+    """Test a model whose info could not be read is learned on a later poll."""
+    mock_api.get_device_info.return_value = {}
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    await coordinator.async_refresh()
+    assert coordinator.capabilities == {}
+
+    mock_api.get_device_info.return_value = {
+        **mock_device, "capabilities": {"modes": ["cool"]},
+    }
+    coordinator.scheduler.schedule(coordinator.data, time.monotonic() - 3600)
+    await coordinator.async_refresh()
+
+    assert coordinator.capabilities[mock_device["model"]].modes == ["cool"]
+    assert mock_api.get_device_info.call_count == 2
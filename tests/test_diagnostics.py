@@ -0,0 +1,23 @@
+"""Test Cuby diagnostics."""
+from unittest.mock import patch
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from custom_components.cuby import DOMAIN
+from custom_components.cuby.diagnostics import async_get_config_entry_diagnostics
+
+async def test_entry_diagnostics(hass, mock_config, mock_device, mock_device_state):
+    """Test diagnostics expose breaker state without credentials."""
+    entry = MockConfigEntry(domain=DOMAIN, data=mock_config)
+    entry.add_to_hass(hass)
+    with patch('custom_components.cuby.CubyAPI.authenticate', return_value=True), \
+         patch('custom_components.cuby.CubyAPI.get_devices', return_value=[mock_device]), \
+         patch('custom_components.cuby.CubyAPI.get_device_info', return_value=mock_device), \
+         patch('custom_components.cuby.CubyAPI.get_device_state', return_value=mock_device_state):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["data"]["password"] == "**REDACTED**"
+    assert diagnostics["last_update_success"]
+    assert diagnostics["api"]["breaker"] == {"state": "closed", "failures": 0}
@@ -1,8 +1,28 @@
 """Test Cuby setup."""
-from unittest.mock import patch, MagicMock
+import asyncio
+import time
+from datetime import timedelta
+import aiohttp
+from unittest.mock import patch, MagicMock, AsyncMock
 import pytest
+from homeassistant import config_entries
+from homeassistant.components.climate import HVACMode
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.setup import async_setup_component
-from custom_components.cuby import DOMAIN
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMockResponse
+from yarl import URL
+from custom_components.cuby import DOMAIN, CubyAPI, async_get_account_manager
+from custom_components.cuby.climate import CubyClimate
+from custom_components.cuby.const import CONF_RATE_BURST, CONF_RATE_LIMIT, STORAGE_SAVE_DELAY
+from custom_components.cuby.coordinator import CubyDataUpdateCoordinator
+from custom_components.cuby.models import CubyDeviceState
+
+TOKEN_URL = "https://cuby.cloud/api/v2/token/test@example.com"
+STATE_URL = "https://cuby.cloud/api/v2/devices/test_device_id/state"
+INFO_URL = "https://cuby.cloud/api/v2/devices/test_device_id"
 
 async def test_setup(hass, mock_config):
     """Test the setup."""
@@ -21,4 +41,554 @@ async def test_setup_failed_auth(hass, mock_config):
             DOMAIN: mock_config
         })
         await hass.async_block_till_done()
-        assert DOMAIN not in hass.data 
\ No newline at end of file
+        assert DOMAIN not in hass.data
+
+async def test_setup_entry(hass, mock_config, mock_device, mock_device_state):
+    """Test a config entry polls each device once per cycle."""
+    entry = MockConfigEntry(domain=DOMAIN, data=mock_config)
+    entry.add_to_hass(hass)
+    with patch('custom_components.cuby.CubyAPI.authenticate', return_value=True), \
+         patch('custom_components.cuby.CubyAPI.get_devices', return_value=[mock_device]), \
+         patch('custom_components.cuby.CubyAPI.get_device_info', return_value=mock_device) as info, \
+         patch('custom_components.cuby.CubyAPI.get_device_state', return_value=mock_device_state) as state:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert hass.states.get("climate.test_ac").state == "cool"
+    assert state.call_count == 1
+    # Capabilities come from the info fetched by the poll itself.
+    assert info.call_count == 1
+
+async def test_get_devices_data_bounded(mock_device_state):
+    """Test bulk fetches run concurrently within the limit and isolate failing devices."""
+    api = CubyAPI("test@example.com", "test_password", max_concurrency=2)
+    api.token = "test_token"
+    in_flight = 0
+    peak = 0
+
+    async def get_device_state(device_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if device_id == "slow":
+            raise asyncio.TimeoutError
+        return mock_device_state
+
+    api.get_device_state = get_device_state
+    api.get_device_info = AsyncMock(side_effect=Exception("boom"))
+    data = await api.get_devices_data(["a", "b", "slow", "c"])
+
+    assert peak == 2
+    assert data["a"].state == CubyDeviceState.from_dict(mock_device_state)
+    assert data["a"].name is None
+    assert data["slow"].state is None
+
+async def test_setup_entry_reuses_flow_discovery(hass, mock_config, mock_device, mock_device_state):
+    """Test setting up an entry right after the config flow skips rediscovery."""
+    with patch('custom_components.cuby.CubyAPI.authenticate', return_value=True), \
+         patch('custom_components.cuby.CubyAPI.get_devices', return_value=[mock_device]) as devices, \
+         patch('custom_components.cuby.CubyAPI.get_device_info', return_value=mock_device), \
+         patch('custom_components.cuby.CubyAPI.get_device_state', return_value=mock_device_state):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}, data=mock_config
+        )
+        await hass.async_block_till_done()
+
+    assert result["result"].state is ConfigEntryState.LOADED
+    assert hass.states.get("climate.test_ac") is not None
+    assert devices.call_count == 1
+
+async def test_accounts_share_session_and_interleave(hass):
+    """Test accounts share the connection pool but keep their own budgets."""
+    manager = async_get_account_manager(hass)
+    first = manager.async_add_account("a", "one@example.com", "password")
+    second = manager.async_add_account("b", "two@example.com", "password")
+    manager.async_add_account("c", "three@example.com", "password")
+
+    assert first._session is second._session
+    assert first.rate_limiter is not second.rate_limiter
+    assert [manager.poll_phase(entry_id) for entry_id in "abc"] == [0, 0.5, 0.25]
+
+    await manager.async_remove_account("b")
+    manager.async_add_account("d", "four@example.com", "password")
+
+    assert manager.poll_phase("d") == 0.5
+    assert set(manager.diagnostics()) == {"a", "c", "d"}
+
+async def test_unload_entry_removes_account(hass, mock_config, mock_device, mock_device_state):
+    """Test unloading an entry releases its account."""
+    entry = MockConfigEntry(domain=DOMAIN, data=mock_config)
+    entry.add_to_hass(hass)
+    with patch('custom_components.cuby.CubyAPI.authenticate', return_value=True), \
+         patch('custom_components.cuby.CubyAPI.get_devices', return_value=[mock_device]), \
+         patch('custom_components.cuby.CubyAPI.get_device_info', return_value=mock_device), \
+         patch('custom_components.cuby.CubyAPI.get_device_state', return_value=mock_device_state):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    manager = async_get_account_manager(hass)
+    assert list(manager.accounts) == [entry.entry_id]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert manager.accounts == {}
+
+async def test_setup_entry_uses_rate_options(hass, mock_config, mock_device, mock_device_state):
+    """Test the account's rate limiter is built from the entry options."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=mock_config,
+        options={CONF_RATE_LIMIT: 2.5, CONF_RATE_BURST: 40},
+    )
+    entry.add_to_hass(hass)
+    with patch('custom_components.cuby.CubyAPI.authenticate', return_value=True), \
+         patch('custom_components.cuby.CubyAPI.get_devices', return_value=[mock_device]), \
+         patch('custom_components.cuby.CubyAPI.get_device_info', return_value=mock_device), \
+         patch('custom_components.cuby.CubyAPI.get_device_state', return_value=mock_device_state):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    limiter = async_get_account_manager(hass).accounts[entry.entry_id].rate_limiter
+    assert (limiter.rate, limiter.burst) == (2.5, 40)
+
+async def test_setup_entry_from_cache_during_outage(hass, hass_storage, mock_config, mock_device, mock_device_state):
+    """Test cached devices are set up without waiting for an unreachable cloud."""
+    entry = MockConfigEntry(domain=DOMAIN, data=mock_config)
+    entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.{entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}",
+        "data": {
+            "devices": [mock_device],
+            "data": {
+                mock_device["id"]: {"info": mock_device, "state": mock_device_state},
+            },
+            "token": {"token": "cached_token", "issued_at": time.time() - 10},
+        },
+    }
+    with patch('custom_components.cuby.CubyAPI.authenticate', return_value=False) as auth, \
+         patch('custom_components.cuby.CubyAPI.get_devices', return_value=[]) as devices, \
+         patch('custom_components.cuby.CubyAPI.get_device_info', return_value={}), \
+         patch('custom_components.cuby.CubyAPI.get_device_state', return_value={}):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        state = hass.states.get("climate.test_ac")
+        assert state.attributes["temperature"] == mock_device_state["target_temperature"]
+        await asyncio.gather(*entry._background_tasks)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("climate.test_ac") is not None
+    assert hass.data[DOMAIN][entry.entry_id].api.token == "cached_token"
+    auth.assert_not_called()
+    assert devices.call_count == 1
+
+async def test_setup_entry_from_cache_probes_in_background(hass, hass_storage, mock_config, mock_device, mock_device_state):
+    """Test a restored entry does not wait for the capability probe."""
+    entry = MockConfigEntry(domain=DOMAIN, data=mock_config)
+    entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.{entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}",
+        "data": {
+            "devices": [mock_device],
+            "data": {
+                mock_device["id"]: {"info": mock_device, "state": mock_device_state},
+            },
+            "token": {"token": "cached_token", "issued_at": time.time() - 10},
+        },
+    }
+    release = asyncio.Event()
+
+    async def slow_info(device_id):
+        await release.wait()
+        return {**mock_device, "capabilities": {"modes": ["cool"]}}
+
+    with patch('custom_components.cuby.CubyAPI.get_devices', return_value=[mock_device]), \
+         patch('custom_components.cuby.CubyAPI.get_device_info', side_effect=slow_info), \
+         patch('custom_components.cuby.CubyAPI.get_device_state', return_value=mock_device_state):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        assert HVACMode.HEAT in hass.states.get("climate.test_ac").attributes["hvac_modes"]
+
+        release.set()
+        await asyncio.gather(*entry._background_tasks)
+        await hass.async_block_till_done()
+
+    assert hass.states.get("climate.test_ac").attributes["hvac_modes"] == [HVACMode.OFF, HVACMode.COOL]
+
+async def test_setup_entry_saves_cache(hass, hass_storage, mock_config, mock_device, mock_device_state):
+    """Test the devices, their data and the token are persisted."""
+    entry = MockConfigEntry(domain=DOMAIN, data=mock_config)
+    entry.add_to_hass(hass)
+
+    async def authenticate(api):
+        api.token = "fresh"
+        api._token_issued = time.monotonic()
+        return True
+
+    with patch('custom_components.cuby.CubyAPI.authenticate', authenticate), \
+         patch('custom_components.cuby.CubyAPI.get_devices', return_value=[mock_device]), \
+         patch('custom_components.cuby.CubyAPI.get_device_info', return_value=mock_device), \
+         patch('custom_components.cuby.CubyAPI.get_device_state', return_value=mock_device_state):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+        await hass.async_block_till_done()
+
+    stored = hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]
+    assert stored["devices"] == [mock_device]
+    assert stored["data"][mock_device["id"]]["state"] == mock_device_state
+    assert stored["token"]["token"] == "fresh"
+
+def test_restore_token_skips_expired_tokens():
+    """Test only tokens that have not expired are reused."""
+    api = CubyAPI("test@example.com", "test_password", expiration=3600)
+
+    assert not api.restore_token({"token": "old", "issued_at": time.time() - 3600})
+    assert api.token is None
+    assert api.restore_token({"token": "recent", "issued_at": time.time() - 60})
+    assert api.export_token()["issued_at"] == pytest.approx(time.time() - 60, abs=1)
+
+async def test_request_reauthenticates_once_on_401(hass, aioclient_mock, mock_device_state):
+    """Test an expired token is replaced and the request replayed."""
+    responses = iter([
+        AiohttpClientMockResponse("get", URL(STATE_URL), status=401),
+        AiohttpClientMockResponse("get", URL(STATE_URL), json=mock_device_state),
+    ])
+
+    async def state_side_effect(method, url, data):
+        return next(responses)
+
+    aioclient_mock.post(TOKEN_URL, json={"status": "ok", "token": "fresh"})
+    aioclient_mock.get(STATE_URL, side_effect=state_side_effect)
+    api = CubyAPI("test@example.com", "test_password")
+    api._session = aioclient_mock.create_session(hass.loop)
+    api.token = "expired"
+
+    assert await api.get_device_state("test_device_id") == mock_device_state
+    assert api.token == "fresh"
+    assert [call[0] for call in aioclient_mock.mock_calls] == ["GET", "POST", "GET"]
+    assert aioclient_mock.mock_calls[-1][3] == {"Authorization": "Bearer fresh"}
+    await api._session.close()
+
+async def test_concurrent_requests_share_one_reauth(hass, aioclient_mock, mock_device_state):
+    """Test many callers with an expired token trigger a single authentication."""
+    aioclient_mock.post(TOKEN_URL, json={"status": "ok", "token": "fresh"})
+    aioclient_mock.get(STATE_URL, json=mock_device_state)
+    api = CubyAPI("test@example.com", "test_password", expiration=3600, rate_burst=100)
+    api._session = aioclient_mock.create_session(hass.loop)
+    api.token = "old"
+    api._token_issued = time.monotonic() - 3600
+
+    results = await asyncio.gather(
+        *(api.get_device_state("test_device_id") for _ in range(50))
+    )
+
+    assert results == [mock_device_state] * 50
+    assert [call[0] for call in aioclient_mock.mock_calls].count("POST") == 1
+    await api._session.close()
+
+async def test_unload_entry_keeps_shared_session(hass, mock_config, mock_device, mock_device_state):
+    """Test unloading an entry releases the client but not HA's shared session."""
+    entry = MockConfigEntry(domain=DOMAIN, data=mock_config)
+    entry.add_to_hass(hass)
+    with patch('custom_components.cuby.CubyAPI.authenticate', return_value=True), \
+         patch('custom_components.cuby.CubyAPI.get_devices', return_value=[mock_device]), \
+         patch('custom_components.cuby.CubyAPI.get_device_info', return_value=mock_device), \
+         patch('custom_components.cuby.CubyAPI.get_device_state', return_value=mock_device_state):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    api = hass.data[DOMAIN][entry.entry_id].api
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert entry.entry_id not in hass.data[DOMAIN]
+    assert api._session is async_get_clientsession(hass)
+    assert not api._session.closed
+
+async def test_close_owned_session(hass):
+    """Test a client closes the session it created itself."""
+    api = CubyAPI("test@example.com", "test_password")
+    api._session = session = aiohttp.ClientSession()
+
+    await api.async_close()
+
+    assert session.closed
+    assert api._session is None
+
+async def test_commands_are_coalesced():
+    """Test back-to-back commands for a device are merged into one request."""
+    api = CubyAPI("test@example.com", "test_password", command_debounce=0.01)
+    api.set_device_state = AsyncMock(return_value=True)
+
+    results = await asyncio.gather(
+        api.set_ac_mode("test_device_id", "heat"),
+        api.set_ac_fan_mode("test_device_id", "high"),
+        api.set_ac_temperature("test_device_id", 21),
+        api.set_ac_temperature("test_device_id", 23),
+        api.set_ac_power("other_device_id", False),
+    )
+
+    assert results == [True] * 5
+    assert api.set_device_state.call_count == 2
+    api.set_device_state.assert_any_call(
+        "test_device_id", {"mode": "heat", "fan_mode": "high", "temperature": 23}
+    )
+    api.set_device_state.assert_any_call("other_device_id", {"power": False})
+
+async def test_invalid_modes_skip_network(aioclient_mock):
+    """Test invalid mode values are rejected before any request is made."""
+    api = CubyAPI("test@example.com", "test_password")
+
+    assert not await api.set_ac_mode("test_device_id", "off")
+    assert not await api.set_ac_fan_mode("test_device_id", "turbo")
+    assert not await api.set_ac_swing_mode("test_device_id", "diagonal")
+    assert not await api.set_ac_full_state("test_device_id", {"power": True, "swing": "x"})
+    assert aioclient_mock.call_count == 0
+
+async def test_writes_are_serialized_per_device():
+    """Test writes to a device never overlap and are sent in order."""
+    api = CubyAPI("test@example.com", "test_password", command_debounce=0)
+    sent = []
+    in_flight = 0
+
+    async def set_device_state(device_id, state):
+        nonlocal in_flight
+        in_flight += 1
+        assert in_flight == 1
+        await asyncio.sleep(0.05)
+        sent.append(state)
+        in_flight -= 1
+        return True
+
+    api.set_device_state = set_device_state
+    first = asyncio.create_task(api.set_ac_temperature("test_device_id", 20))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(api.set_ac_fan_mode("test_device_id", "high"))
+    third = asyncio.create_task(api.set_ac_mode("test_device_id", "heat"))
+
+    assert await asyncio.gather(first, second, third) == [True, True, True]
+    assert sent == [{"temperature": 20}, {"fan_mode": "high", "mode": "heat"}]
+
+async def test_superseded_write_is_cancelled():
+    """Test a write in flight is cancelled once all its values are overridden."""
+    api = CubyAPI("test@example.com", "test_password", command_debounce=0)
+    sent = []
+
+    async def set_device_state(device_id, state):
+        await asyncio.sleep(1 if state["temperature"] == 20 else 0)
+        sent.append(state)
+        return True
+
+    api.set_device_state = AsyncMock(side_effect=set_device_state)
+    first = asyncio.create_task(api.set_ac_temperature("test_device_id", 20))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(api.set_ac_temperature("test_device_id", 22))
+
+    assert await asyncio.wait_for(asyncio.gather(first, second), 0.5) == [True, True]
+    assert sent == [{"temperature": 22}]
+    assert api.set_device_state.call_count == 2
+
+async def test_reads_wait_for_writes(mock_device_state):
+    """Test a state read is not served while a write to the device is pending."""
+    api = CubyAPI("test@example.com", "test_password", command_debounce=0)
+    events = []
+
+    async def set_device_state(device_id, state):
+        await asyncio.sleep(0.05)
+        events.append("write")
+        return True
+
+    async def request(method, path, **kwargs):
+        events.append("read")
+        return 200, mock_device_state
+
+    api.set_device_state = set_device_state
+    api._request = request
+    write = asyncio.create_task(api.set_ac_power("test_device_id", False))
+    await asyncio.sleep(0)
+
+    assert await api.get_device_state("test_device_id") == mock_device_state
+    assert await write
+    assert events == ["write", "read"]
+
+async def test_request_retries_throttled_responses(hass, aioclient_mock, mock_device_state):
+    """Test 429 and 5xx responses are retried, honouring a capped Retry-After."""
+    responses = iter([
+        AiohttpClientMockResponse("get", URL(STATE_URL), status=429, headers={"Retry-After": "3600"}),
+        AiohttpClientMockResponse("get", URL(STATE_URL), status=503),
+        AiohttpClientMockResponse("get", URL(STATE_URL), json=mock_device_state),
+    ])
+
+    async def state_side_effect(method, url, data):
+        return next(responses)
+
+    aioclient_mock.get(STATE_URL, side_effect=state_side_effect)
+    api = CubyAPI("test@example.com", "test_password")
+    api._session = aioclient_mock.create_session(hass.loop)
+    api.token = "test_token"
+
+    with patch("custom_components.cuby.RETRY_BACKOFF_BASE", 0.01), \
+         patch("custom_components.cuby.RETRY_BACKOFF_MAX", 0.01):
+        assert await api.get_device_state("test_device_id") == mock_device_state
+    assert aioclient_mock.call_count == 3
+    await api._session.close()
+
+async def test_device_info_is_cached_and_revalidated(hass, aioclient_mock, mock_device):
+    """Test device info is cached and revalidated with its ETag once stale."""
+    responses = iter([
+        AiohttpClientMockResponse("get", URL(INFO_URL), json=mock_device, headers={"ETag": '"v1"'}),
+        AiohttpClientMockResponse("get", URL(INFO_URL), status=304),
+    ])
+
+    async def info_side_effect(method, url, data):
+        return next(responses)
+
+    aioclient_mock.get(INFO_URL, side_effect=info_side_effect)
+    api = CubyAPI("test@example.com", "test_password")
+    api._session = aioclient_mock.create_session(hass.loop)
+    api.token = "test_token"
+
+    results = await asyncio.gather(
+        api.get_device_info("test_device_id"), api.get_device_info("test_device_id")
+    )
+    assert results == [mock_device, mock_device]
+    assert await api.get_device_info("test_device_id") == mock_device
+    assert aioclient_mock.call_count == 1
+
+    api.cache.get("devices/test_device_id").expires = 0
+    assert await api.get_device_info("test_device_id") == mock_device
+    assert aioclient_mock.call_count == 2
+    assert aioclient_mock.mock_calls[1][3]["If-None-Match"] == '"v1"'
+    assert api.diagnostics()["cache"] == {"entries": 1, "hits": 2, "misses": 2}
+    await api._session.close()
+
+async def test_failed_fetches_invalidate_device_info(hass, aioclient_mock, mock_device):
+    """Test a failed fetch drops the cached device info."""
+    responses = iter([
+        AiohttpClientMockResponse("get", URL(INFO_URL), json=mock_device, headers={"ETag": '"v1"'}),
+        AiohttpClientMockResponse("get", URL(INFO_URL), json=mock_device, headers={"ETag": '"v1"'}),
+        AiohttpClientMockResponse("get", URL(INFO_URL), status=404),
+    ])
+
+    async def info_side_effect(method, url, data):
+        return next(responses)
+
+    aioclient_mock.get(INFO_URL, side_effect=info_side_effect)
+    aioclient_mock.get(STATE_URL, status=404)
+    api = CubyAPI("test@example.com", "test_password")
+    api._session = aioclient_mock.create_session(hass.loop)
+    api.token = "test_token"
+
+    assert await api.get_device_info("test_device_id") == mock_device
+    await api.get_devices_data(["test_device_id"], include_info=False)
+    assert api.cache.get("devices/test_device_id") is None
+
+    assert await api.get_device_info("test_device_id") == mock_device
+    api.cache.get("devices/test_device_id").expires = 0
+    assert await api.get_device_info("test_device_id") == {}
+    assert api.cache.get("devices/test_device_id") is None
+    await api._session.close()
+
+async def test_throttling_does_not_fail_devices(hass, aioclient_mock, mock_device_state):
+    """Test a Retry-After pause longer than the request timeout fails no device."""
+    responses = iter([
+        AiohttpClientMockResponse("get", URL(STATE_URL), status=429, headers={"Retry-After": "0.3"}),
+        AiohttpClientMockResponse("get", URL(STATE_URL), json=mock_device_state),
+    ])
+
+    async def state_side_effect(method, url, data):
+        return next(responses)
+
+    aioclient_mock.get(STATE_URL, side_effect=state_side_effect)
+    api = CubyAPI("test@example.com", "test_password", request_timeout=0.1)
+    api._session = aioclient_mock.create_session(hass.loop)
+    api.token = "test_token"
+
+    data = await api.get_devices_data(["test_device_id"], include_info=False)
+
+    assert data["test_device_id"].state == CubyDeviceState.from_dict(mock_device_state)
+    assert api.device_breaker("test_device_id").failures == 0
+    await api._session.close()
+
+async def test_request_gives_up_after_max_retries(hass, aioclient_mock):
+    """Test a persistently failing endpoint is not retried forever."""
+    aioclient_mock.get(STATE_URL, status=500)
+    api = CubyAPI("test@example.com", "test_password", max_retries=2)
+    api._session = aioclient_mock.create_session(hass.loop)
+    api.token = "test_token"
+
+    with patch("custom_components.cuby.RETRY_BACKOFF_BASE", 0.01):
+        assert await api.get_device_state("test_device_id") == {}
+    assert aioclient_mock.call_count == 3
+    await api._session.close()
+
+async def test_device_breaker_short_circuits(hass, aioclient_mock):
+    """Test a failing device stops being requested while its breaker is open."""
+    aioclient_mock.get(STATE_URL, status=500)
+    api = CubyAPI("test@example.com", "test_password", max_retries=0)
+    api._session = aioclient_mock.create_session(hass.loop)
+    api.token = "test_token"
+
+    for _ in range(5):
+        assert await api.get_device_state("test_device_id") == {}
+
+    assert aioclient_mock.call_count == 3
+    assert api.diagnostics()["device_breakers"]["test_device_id"]["state"] == "open"
+    assert api.diagnostics()["breaker"]["state"] == "closed"
+    await api._session.close()
+
+async def test_server_errors_open_global_breaker(hass, aioclient_mock):
+    """Test a cloud answering 503 opens the global breaker."""
+    aioclient_mock.get("https://cuby.cloud/api/v2/devices", status=503)
+    api = CubyAPI("test@example.com", "test_password", max_retries=0)
+    api._session = aioclient_mock.create_session(hass.loop)
+    api.token = "test_token"
+
+    for _ in range(20):
+        assert await api.get_devices() == []
+
+    assert aioclient_mock.call_count == 5
+    assert api.diagnostics()["breaker"]["state"] == "open"
+    await api._session.close()
+
+async def test_open_breaker_makes_entities_unavailable(hass, aioclient_mock, mock_device, mock_device_state):
+    """Test entities go unavailable at once when the global breaker opens."""
+    aioclient_mock.get(STATE_URL, json=mock_device_state)
+    aioclient_mock.get(INFO_URL, json=mock_device)
+    api = CubyAPI("test@example.com", "test_password")
+    api._session = aioclient_mock.create_session(hass.loop)
+    api.token = "test_token"
+    coordinator = CubyDataUpdateCoordinator(hass, api, [mock_device])
+    await coordinator.async_refresh()
+    climate = CubyClimate(coordinator, mock_device)
+    assert climate.available
+
+    for _ in range(api.breaker.threshold):
+        api.breaker.record_failure()
+    coordinator.scheduler.schedule(coordinator.data, time.monotonic() - 3600)
+    await coordinator.async_refresh()
+    climate._update_from_state()
+
+    assert api.short_circuited == {mock_device["id"]}
+    assert not coordinator.last_update_success
+    assert not climate.available
+    await coordinator.async_shutdown()
+    await api._session.close()
+
+async def test_requests_are_instrumented(hass, aioclient_mock, mock_device_state):
+    """Test every request records its endpoint metrics."""
+    aioclient_mock.post(TOKEN_URL, json={"status": "ok", "token": "fresh"})
+    aioclient_mock.get(STATE_URL, json=mock_device_state)
+    api = CubyAPI("test@example.com", "test_password")
+    api._session = aioclient_mock.create_session(hass.loop)
+
+    await api.get_device_state("test_device_id")
+
+    metrics = api.diagnostics()["metrics"]
+    assert metrics["token"]["requests"] == 1
+    assert metrics["devices/{id}/state"]["requests"] == 1
+    assert metrics["devices/{id}/state"]["errors"] == 0
+    assert metrics["devices/{id}/state"]["bytes_received"] > 0
+    assert metrics["devices/{id}/state"]["bytes_sent"] == 0
+    assert metrics["token"]["bytes_sent"] > 0
+    await api._session.close()
@@ -0,0 +1,28 @@
+"""Test the Cuby request metrics."""
+import pytest
+from custom_components.cuby.metrics import CubyMetrics, endpoint_name
+
+def test_endpoint_names():
+    """Test request paths are grouped by endpoint."""
+    assert endpoint_name("token/test@example.com") == "token"
+    assert endpoint_name("devices") == "devices"
+    assert endpoint_name("devices/abc") == "devices/{id}"
+    assert endpoint_name("devices/abc/state") == "devices/{id}/state"
+
+def test_metrics_record():
+    """Test counters, bytes and the latency histogram are recorded."""
+    metrics = CubyMetrics()
+    metrics.endpoint("devices/a/state").record(0.02, 100, False, 20)
+    metrics.endpoint("devices/b/state").record(0.3, 50, True)
+    metrics.endpoint("devices").record(20, 0, True)
+
+    state = metrics.as_dict()["devices/{id}/state"]
+    assert state["requests"] == 2
+    assert state["errors"] == 1
+    assert state["bytes_received"] == 150
+    assert state["bytes_sent"] == 20
+    assert state["latency_histogram"]["<=0.05s"] == 1
+    assert state["latency_histogram"]["<=0.5s"] == 1
+    assert metrics.as_dict()["devices"]["latency_histogram"]["+Inf"] == 1
+    assert metrics.total("requests") == 3
+    assert metrics.average_latency == pytest.approx(20.32 / 3)
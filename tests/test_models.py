@@ -0,0 +1,25 @@
+"""Test the Cuby device models."""
+from homeassistant.components.climate.const import FAN_HIGH, HVACMode
+from custom_components.cuby.models import CubyDevice, CubyDeviceState
+
+def test_state_precomputes_ha_modes(mock_device_state):
+    """Test the Home Assistant modes are derived once from the raw state."""
+    state = CubyDeviceState.from_dict({**mock_device_state, "fan_mode": "high"})
+
+    assert state.hvac_mode == HVACMode.COOL
+    assert state.ha_fan_mode == FAN_HIGH
+    assert state.replace(power=False).hvac_mode == HVACMode.OFF
+    assert state.power is True
+    assert CubyDeviceState.from_dict({}) is None
+
+def test_device_keeps_only_used_fields(mock_device, mock_device_state):
+    """Test a device exposes its info and state as attributes."""
+    device = CubyDevice(
+        mock_device["id"],
+        {**mock_device, "unused": "x"},
+        CubyDeviceState.from_dict(mock_device_state),
+    )
+
+    assert device.name == mock_device["name"]
+    assert device.online is True
+    assert not hasattr(device, "__dict__")
@@ -0,0 +1,39 @@
+"""Test the Cuby request rate limiter."""
+import asyncio
+import time
+import pytest
+from custom_components.cuby.ratelimit import CubyRateLimiter
+
+async def test_burst_then_refill():
+    """Test the bucket allows a burst and then paces requests."""
+    limiter = CubyRateLimiter(rate=100, burst=3)
+    start = time.monotonic()
+
+    for _ in range(5):
+        await limiter.acquire()
+
+    assert time.monotonic() - start >= 0.015
+
+async def test_writes_are_served_before_reads():
+    """Test waiting writes jump ahead of waiting reads."""
+    limiter = CubyRateLimiter(rate=50, burst=1)
+    await limiter.acquire()
+    order = []
+
+    async def request(name, write):
+        await limiter.acquire(write=write)
+        order.append(name)
+
+    await asyncio.gather(request("read", False), request("write", True))
+
+    assert order == ["write", "read"]
+
+async def test_pause_holds_back_requests():
+    """Test a server requested pause delays every request."""
+    limiter = CubyRateLimiter(rate=100, burst=5)
+    limiter.pause(0.05)
+    start = time.monotonic()
+
+    await limiter.acquire(write=True)
+
+    assert time.monotonic() - start >= 0.05
@@ -1,24 +1,120 @@
 """Test Cuby sensor platform."""
 from unittest.mock import patch, MagicMock, AsyncMock
 import pytest
-from custom_components.cuby.sensor import CubyWiFiSensor, CubyOnlineSensor
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import UnitOfEnergy, UnitOfTime
+from homeassistant.core import State
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    mock_restore_cache_with_extra_data,
+)
+from custom_components.cuby import DOMAIN
+from custom_components.cuby.coordinator import CubyDataUpdateCoordinator
+from custom_components.cuby.sensor import (
+    CubyWiFiSensor,
+    CubyOnlineSensor,
+    CubyModeSensor,
+    CubyApiMetricSensor,
+    CubyUsageSensor,
+)
+from custom_components.cuby.models import CubyDeviceState
 
-async def test_wifi_sensor(hass, mock_device):
+async def test_wifi_sensor(hass, mock_api, mock_device):
     """Test WiFi signal strength sensor."""
-    api = MagicMock()
-    api.get_device_info = AsyncMock(return_value={"wifi_signal": -65})
+    mock_api.get_device_info = AsyncMock(return_value={"wifi_signal": -65})
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    await coordinator.async_refresh()
     
-    sensor = CubyWiFiSensor(api, mock_device)
-    await sensor.async_update()
+    sensor = CubyWiFiSensor(coordinator, mock_device)
     
     assert sensor.native_value == -65
 
-async def test_online_sensor(hass, mock_device):
+async def test_online_sensor(hass, mock_api, mock_device):
     """Test online status sensor."""
-    api = MagicMock()
-    api.get_device_info = AsyncMock(return_value={"online": True})
+    mock_api.get_device_info = AsyncMock(return_value={"online": True})
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    await coordinator.async_refresh()
     
-    sensor = CubyOnlineSensor(api, mock_device)
-    await sensor.async_update()
+    sensor = CubyOnlineSensor(coordinator, mock_device)
     
-    assert sensor.native_value == "online" 
\ No newline at end of file
+    assert sensor.native_value == "online"
+
+async def test_sensors_share_one_fetch(hass, mock_api, mock_device):
+    """Test all sensors of a device are served by a single poll cycle."""
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    await coordinator.async_refresh()
+    
+    sensors = [
+        CubyWiFiSensor(coordinator, mock_device),
+        CubyOnlineSensor(coordinator, mock_device),
+        CubyModeSensor(coordinator, mock_device),
+    ]
+    
+    assert [sensor.native_value for sensor in sensors] == [-65, "online", "cool"]
+    mock_api.get_device_info.assert_called_once_with(mock_device["id"])
+    mock_api.get_device_state.assert_called_once_with(mock_device["id"])
+
+async def test_api_metric_sensor(hass, mock_api, mock_config):
+    """Test API metric sensors read the client's counters."""
+    entry = MockConfigEntry(domain=DOMAIN, data=mock_config, title="test@example.com")
+    mock_api.metrics.endpoint("devices").record(0.2, 10, False)
+    mock_api.metrics.endpoint("devices/a/state").record(0.4, 10, True)
+
+    requests = CubyApiMetricSensor(mock_api, entry, "requests", "API Requests", None, True)
+    latency = CubyApiMetricSensor(
+        mock_api, entry, "average_latency", "API Average Latency", "ms", False
+    )
+    await requests.async_update()
+    await latency.async_update()
+
+    assert requests.native_value == 2
+    assert latency.native_value == 300.0
+
+async def test_usage_sensors_integrate_state(hass, mock_api, mock_device, mock_device_state):
+    """Test runtime and energy grow only while the device runs."""
+    coordinator = CubyDataUpdateCoordinator(hass, mock_api, [mock_device])
+    await coordinator.async_refresh()
+    clock = MagicMock(return_value=0)
+
+    with patch("custom_components.cuby.sensor.time.monotonic", clock):
+        runtime = CubyUsageSensor(
+            coordinator, mock_device, "runtime", "Runtime", UnitOfTime.HOURS,
+            SensorDeviceClass.DURATION,
+        )
+        energy = CubyUsageSensor(
+            coordinator, mock_device, "energy", "Estimated Energy",
+            UnitOfEnergy.KILO_WATT_HOUR, SensorDeviceClass.ENERGY,
+        )
+        clock.return_value = 1800
+        coordinator.data[mock_device["id"]].state = CubyDeviceState.from_dict(
+            {**mock_device_state, "power": False}
+        )
+        runtime._update_from_data()
+        energy._update_from_data()
+        clock.return_value = 3600
+        runtime._update_from_data()
+        energy._update_from_data()
+
+    assert runtime.native_value == 0.5
+    assert energy.native_value == 0.5
+
+async def test_usage_sensor_restores_total(hass, mock_config, mock_device, mock_device_state):
+    """Test the running total survives a restart."""
+    mock_restore_cache_with_extra_data(
+        hass,
+        [(
+            State("sensor.test_ac_runtime", "12.5"),
+            {"native_value": 12.5, "native_unit_of_measurement": UnitOfTime.HOURS},
+        )],
+    )
+    entry = MockConfigEntry(domain=DOMAIN, data=mock_config)
+    entry.add_to_hass(hass)
+    with patch('custom_components.cuby.CubyAPI.authenticate', return_value=True), \
+         patch('custom_components.cuby.CubyAPI.get_devices', return_value=[mock_device]), \
+         patch('custom_components.cuby.CubyAPI.get_device_info', return_value=mock_device), \
+         patch('custom_components.cuby.CubyAPI.get_device_state', return_value=mock_device_state):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert float(hass.states.get("sensor.test_ac_runtime").state) == pytest.approx(12.5, abs=0.01)
+    assert hass.states.get("sensor.test_ac_runtime_today") is None
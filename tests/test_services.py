@@ -0,0 +1,90 @@
+"""Test the Cuby services."""
+from unittest.mock import patch, AsyncMock
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from custom_components.cuby import DOMAIN, CubyAPI
+from custom_components.cuby.services import SERVICE_SET_GROUP_STATE
+
+@pytest.fixture
+async def setup_entry(hass, mock_config, mock_device, mock_device_state):
+    """Set up an entry with two devices."""
+    devices = [mock_device, {**mock_device, "id": "second_id", "name": "Second AC"}]
+    entry = MockConfigEntry(domain=DOMAIN, data=mock_config)
+    entry.add_to_hass(hass)
+    with patch('custom_components.cuby.CubyAPI.authenticate', return_value=True), \
+         patch('custom_components.cuby.CubyAPI.get_devices', return_value=devices), \
+         patch('custom_components.cuby.CubyAPI.get_device_info', return_value=mock_device), \
+         patch('custom_components.cuby.CubyAPI.get_device_state', return_value=mock_device_state):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return hass.data[DOMAIN][entry.entry_id]
+
+async def test_set_group_state_retries_only_failures(hass, setup_entry, mock_device):
+    """Test failed devices are retried without resending to the others."""
+    setup_entry.api.command_debounce = 0
+    outcomes = {mock_device["id"]: iter([True]), "second_id": iter([False, True])}
+
+    async def set_device_state(device_id, state):
+        return next(outcomes[device_id])
+
+    with patch.object(setup_entry.api, "set_device_state", side_effect=set_device_state) as send, \
+         patch('custom_components.cuby._backoff_delay', return_value=0):
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_GROUP_STATE,
+            {"device_ids": [mock_device["id"], "second_id", "missing"], "power": False},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert response["results"] == {
+        mock_device["id"]: {"success": True},
+        "second_id": {"success": True},
+        "missing": {"success": False, "error": "unknown_device"},
+    }
+    assert [call.args for call in send.call_args_list] == [
+        (mock_device["id"], {"power": False}),
+        ("second_id", {"power": False}),
+        ("second_id", {"power": False}),
+    ]
+    assert setup_entry.data["second_id"].state.power is False
+    await setup_entry.async_shutdown()
+
+async def test_set_group_state_raises_without_response(hass, setup_entry, mock_device):
+    """Test failures raise when the caller does not ask for a response."""
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_GROUP_STATE,
+            {"device_ids": ["missing"], "mode": "cool"},
+            blocking=True,
+        )
+
+async def test_group_state_is_validated():
+    """Test an invalid group state is rejected before any request."""
+    api = CubyAPI("test@example.com", "test_password")
+    api.queue_device_state = AsyncMock()
+
+    assert await api.set_group_state(["a", "b"], {"mode": "off"}) == {"a": False, "b": False}
+    api.queue_device_state.assert_not_called()
+
+async def test_set_group_state_with_yaml_setup(hass):
+    """Test the service reports unknown devices when set up from YAML."""
+    with patch('custom_components.cuby.CubyAPI.authenticate', return_value=True):
+        assert await async_setup_component(hass, DOMAIN, {
+            DOMAIN: {"username": "test@example.com", "password": "test_password"}
+        })
+        await hass.async_block_till_done()
+    assert isinstance(hass.data[DOMAIN], CubyAPI)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_GROUP_STATE,
+        {"device_ids": ["missing"], "power": False},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["results"] == {"missing": {"success": False, "error": "unknown_device"}}